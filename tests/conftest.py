@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+
+@pytest.fixture(scope="session")
+def sample_regression_df():
+    n_hours = 24 * 30
+    n_features = 10
+    X = np.random.default_rng(0).standard_normal((n_hours, n_features))
+    start = datetime(2023, 1, 1)
+
+    return pl.DataFrame(
+        X, schema={f"feature_{i}": pl.Float64 for i in range(n_features)}
+    ).with_columns(
+        pl.datetime_range(
+            start,
+            start + timedelta(hours=n_hours - 1),
+            interval="1h",
+            eager=True,
+        ).alias("date")
+    )
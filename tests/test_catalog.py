@@ -1,49 +1,52 @@
+import asyncio
 import os
-import shutil
 from datetime import datetime
 from pathlib import Path
 
 import polars as pl
 import pytest
-from deltalake import DeltaTable
 
+from timelake.base import BaseTimeLakeStorage
 from timelake.catalog import TimeLakeCatalog
-from timelake.constants import CatalogEntryType
+from timelake.constants import CATALOG_CHECKPOINT_INTERVAL, CatalogEntryType
 from timelake.models import DatasetEntry, TimeLakeEntry
-
-TEST_PATH = Path("./timelake_catalog_test")
+from timelake.preprocessor import TimeLakePreprocessor
 
 
 @pytest.fixture(scope="function")
-def catalog():
-    if TEST_PATH.exists():
-        shutil.rmtree(TEST_PATH)
-
-    os.makedirs(TEST_PATH)
-
-    catalog = TimeLakeCatalog.create_catalog(str(TEST_PATH))
-
-    yield catalog
+def catalog(tmp_path: Path):
+    # tmp_path is a fresh per-test directory cleaned up by pytest
+    return TimeLakeCatalog.create_catalog(str(tmp_path))
+
+
+@pytest.fixture(scope="module")
+def make_entry():
+    def _make(**overrides) -> TimeLakeEntry:
+        # model_construct skips validation and TimeLakeEntry.__init__, so the
+        # entry_type it would normally inject is passed explicitly
+        defaults = dict(
+            entry_type=CatalogEntryType.TIMELAKE_CONFIG.value,
+            timestamp_column="date",
+            timestamp_partition_column="date_day",
+            partition_by=["date_day"],
+            timelake_id="test-id",
+            timelake_storage="LocalTimeLakeStorage",
+            timelake_preprocessor="TimeLakePreprocessor",
+            name="Test TimeLake",
+        )
+        defaults.update(overrides)
+        return TimeLakeEntry.model_construct(**defaults)
 
-    if TEST_PATH.exists():
-        shutil.rmtree(TEST_PATH)
+    return _make
 
 
 def test_create_catalog(catalog: TimeLakeCatalog):
     # Just check that catalog was created successfully
-    assert os.path.exists(f"{TEST_PATH}/_timelake_catalog")
+    assert os.path.exists(f"{catalog.path}/_timelake_catalog")
 
 
-def test_add_entry(catalog: TimeLakeCatalog):
-    config = TimeLakeEntry(
-        timestamp_column="date",
-        timestamp_partition_column="date_day",
-        partition_by=["date_day"],
-        timelake_id="test-id",
-        timelake_storage="LocalTimeLakeStorage",
-        timelake_preprocessor="TimeLakePreprocessor",
-        name="Test TimeLake",
-    )
+def test_add_entry(catalog: TimeLakeCatalog, make_entry):
+    config = make_entry()
 
     entry_id = catalog.add_entry(config)
     assert entry_id is not None
@@ -53,18 +56,19 @@ def test_add_entry(catalog: TimeLakeCatalog):
     assert len(entries) == 1
     assert isinstance(entries[0], TimeLakeEntry)
     assert entries[0].timestamp_column == "date"
+    assert entries[0].id == entry_id
 
-
-def test_get_timelake_entry(catalog: TimeLakeCatalog):
-    config = TimeLakeEntry(
-        timestamp_column="date",
-        timestamp_partition_column="date_day",
-        partition_by=["date_day"],
-        timelake_id="test-id",
-        timelake_storage="LocalTimeLakeStorage",
-        timelake_preprocessor="TimeLakePreprocessor",
-        name="Test TimeLake",
+    # Ids are stored as strings, so caller-provided ids need not be uuids
+    assert pl.read_delta(catalog.catalog_path)["id"].dtype == pl.String
+    assert catalog.add_entry(make_entry(id="custom-id", name="Other")) == "custom-id"
+    other = catalog.get_entry_by_name(
+        "Other", entry_type=CatalogEntryType.TIMELAKE_CONFIG.value
     )
+    assert other.id == "custom-id"
+
+
+def test_get_timelake_entry(catalog: TimeLakeCatalog, make_entry):
+    config = make_entry()
 
     catalog.add_entry(config)
 
@@ -86,16 +90,8 @@ def test_get_timelake_entry(catalog: TimeLakeCatalog):
     )
 
 
-def test_update_entry(catalog: TimeLakeCatalog):
-    config = TimeLakeEntry(
-        timestamp_column="date",
-        timestamp_partition_column="date_day",
-        partition_by=["date_day"],
-        timelake_id="test-id",
-        timelake_storage="LocalTimeLakeStorage",
-        timelake_preprocessor="TimeLakePreprocessor",
-        name="Test TimeLake",
-    )
+def test_update_entry(catalog: TimeLakeCatalog, make_entry):
+    config = make_entry()
 
     catalog.add_entry(config)
 
@@ -114,22 +110,23 @@ def test_update_entry(catalog: TimeLakeCatalog):
     assert entry is not None
     assert entry.name == "Updated TimeLake"
 
+    # Re-applying the same value is a no-op and adds no commit
+    version = catalog._table().version()
+    assert catalog.update_entry(
+        "Test TimeLake",
+        entry_type=CatalogEntryType.TIMELAKE_CONFIG.value,
+        properties={"timestamp_column": "date"},
+    )
+    assert catalog._table().version() == version
+
     # Try updating a non-existent entry
     assert not catalog.update_entry(
         "non-existent", CatalogEntryType.TIMELAKE_CONFIG.value, {"name": "Something"}
     )
 
 
-def test_delete_entry(catalog: TimeLakeCatalog):
-    config = TimeLakeEntry(
-        timestamp_column="date",
-        timestamp_partition_column="date_day",
-        partition_by=["date_day"],
-        timelake_id="test-id",
-        timelake_storage="LocalTimeLakeStorage",
-        timelake_preprocessor="TimeLakePreprocessor",
-        name="Test TimeLake",
-    )
+def test_delete_entry(catalog: TimeLakeCatalog, make_entry):
+    config = make_entry()
 
     catalog.add_entry(config)
 
@@ -148,17 +145,57 @@ def test_delete_entry(catalog: TimeLakeCatalog):
     assert not catalog.delete_entry("non-existent")
 
 
-def test_list_entries_by_type(catalog: TimeLakeCatalog):
-    # Add a timelake config
-    timelake_config = TimeLakeEntry(
-        timestamp_column="date",
-        timestamp_partition_column="date_day",
-        partition_by=["date_day"],
-        timelake_id="test-id-1",
-        timelake_storage="LocalTimeLakeStorage",
-        timelake_preprocessor="TimeLakePreprocessor",
-        name="Test TimeLake",
+def test_get_timelake_config_cache(catalog: TimeLakeCatalog, make_entry):
+    assert catalog.get_timelake_config() is None
+
+    catalog.add_entry(make_entry())
+    config = catalog.get_timelake_config()
+    assert config is not None
+
+    # Unchanged catalog returns the cached config
+    assert catalog.get_timelake_config() is config
+
+    # A catalog write invalidates the cache
+    catalog.update_entry(
+        "Test TimeLake",
+        entry_type=CatalogEntryType.TIMELAKE_CONFIG.value,
+        properties={"timestamp_column": "ts"},
     )
+    updated = catalog.get_timelake_config()
+    assert updated is not config
+    assert updated.timestamp_column == "ts"
+
+
+def test_get_timelake_config_shared_cache(catalog: TimeLakeCatalog, make_entry):
+    catalog.add_entry(make_entry())
+    config = catalog.get_timelake_config()
+
+    # Reopening the unchanged catalog reuses the config read by another instance
+    reopened = TimeLakeCatalog.open_catalog(catalog.path)
+    assert reopened.get_timelake_config() is config
+
+
+def test_list_entries_cache(catalog: TimeLakeCatalog, make_entry):
+    catalog.add_entry(make_entry())
+    entries = catalog.list_entries()
+
+    # Unchanged catalog returns the cached entries
+    assert catalog.list_entries()[0] is entries[0]
+
+    # A catalog write invalidates the cache
+    catalog.delete_entry("Test TimeLake")
+    assert catalog.list_entries() == []
+    assert (
+        catalog.get_entry_by_name(
+            "Test TimeLake", entry_type=CatalogEntryType.TIMELAKE_CONFIG.value
+        )
+        is None
+    )
+
+
+def test_list_entries_by_type(catalog: TimeLakeCatalog, make_entry):
+    # Add a timelake config
+    timelake_config = make_entry(timelake_id="test-id-1")
     catalog.add_entry(timelake_config)
 
     # Add a dataset config
@@ -188,17 +225,30 @@ def test_list_entries_by_type(catalog: TimeLakeCatalog):
     assert dataset_entries[0].name == "test_dataset"
 
 
+def test_get_entries_by_names(catalog: TimeLakeCatalog, make_entry):
+    catalog.add_entry(make_entry())
+    catalog.add_entry(make_entry(name="Other TimeLake", timelake_id="test-id-2"))
+
+    entries = catalog.get_entries_by_names(
+        ["Test TimeLake", "Other TimeLake", "non-existent"],
+        entry_type=CatalogEntryType.TIMELAKE_CONFIG.value,
+    )
+    assert set(entries) == {"Test TimeLake", "Other TimeLake"}
+    assert entries["Other TimeLake"].timelake_id == "test-id-2"
+
+
 def test_create_dataset(catalog: TimeLakeCatalog):
     df = pl.DataFrame(
         {
             "date": [datetime(2024, 1, 1), datetime(2024, 1, 2)],
             "value": [100.0, 200.0],
-        }
+        },
+        schema={"date": pl.Datetime, "value": pl.Float64},
     )
 
     dataset_entry = catalog.create_dataset(
         name="test_dataset",
-        path=Path(f"{TEST_PATH}/test_dataset"),
+        path=Path(f"{catalog.path}/test_dataset"),
         df=df,
         partition_columns=[],
     )
@@ -206,10 +256,80 @@ def test_create_dataset(catalog: TimeLakeCatalog):
     # Verify dataset entry
     assert isinstance(dataset_entry, DatasetEntry)
     assert dataset_entry.name == "test_dataset"
-    assert dataset_entry.path == f"{TEST_PATH}/test_dataset"
+    assert dataset_entry.path == f"{catalog.path}/test_dataset"
 
     # Verify dataset was written to the path
-    dt = DeltaTable(dataset_entry.path)
-    written_df = pl.read_delta(dt)
-    assert written_df.shape == df.shape
-    assert sorted(written_df.columns) == sorted(df.columns)
+    written_lf = pl.scan_delta(dataset_entry.path)
+    written_schema = written_lf.collect_schema()
+    assert written_lf.select(pl.len()).collect().item() == df.height
+    assert written_schema.len() == df.width
+    assert set(written_schema.names()) == set(df.columns)
+
+
+def test_list_entries_after_rename(catalog: TimeLakeCatalog, make_entry):
+    catalog.add_entry(make_entry())
+    catalog.update_entry(
+        "Test TimeLake",
+        entry_type=CatalogEntryType.TIMELAKE_CONFIG.value,
+        properties={"name": "Renamed TimeLake"},
+    )
+
+    # The renamed property takes precedence over the stored name column
+    entries = catalog.list_entries()
+    assert len(entries) == 1
+    assert entries[0].name == "Renamed TimeLake"
+
+
+def test_async_reads(catalog: TimeLakeCatalog, make_entry):
+    catalog.add_entry(make_entry())
+    catalog.add_entry(make_entry(name="Other TimeLake", timelake_id="test-id-2"))
+
+    async def read_all():
+        return await asyncio.gather(
+            catalog.aget_entry_by_name(
+                "Test TimeLake", CatalogEntryType.TIMELAKE_CONFIG.value
+            ),
+            catalog.aget_entry_by_name(
+                "Other TimeLake", CatalogEntryType.TIMELAKE_CONFIG.value
+            ),
+            catalog.alist_entries(),
+        )
+
+    first, second, entries = asyncio.run(read_all())
+    assert first.name == "Test TimeLake"
+    assert second.timelake_id == "test-id-2"
+    assert len(entries) == 2
+
+
+def test_catalog_checkpoint(catalog: TimeLakeCatalog, make_entry):
+    log_dir = Path(catalog.catalog_path) / "_delta_log"
+    for i in range(CATALOG_CHECKPOINT_INTERVAL):
+        assert not (log_dir / "_last_checkpoint").exists()
+        # Each commit comes from a freshly opened catalog, as in separate processes
+        reopened = TimeLakeCatalog.open_catalog(catalog.path)
+        reopened.add_entry(make_entry(name=f"TimeLake {i}"))
+
+    # A checkpoint is written once the interval is reached
+    assert (log_dir / "_last_checkpoint").exists()
+    assert len(catalog.list_entries()) == CATALOG_CHECKPOINT_INTERVAL
+
+
+def test_timelake_config_custom_storage(catalog: TimeLakeCatalog):
+    class CustomStorage(BaseTimeLakeStorage):
+        path = "custom://lake"
+
+        @staticmethod
+        def create_storage(storage_type, path, **kwargs):
+            return CustomStorage()
+
+        def ensure_directories(self):
+            pass
+
+        def get_storage_options(self):
+            return {}
+
+    # Storages without a StorageType are recorded by class name
+    _, config = catalog.get_or_create_timelake_config(
+        "date", TimeLakePreprocessor(), CustomStorage()
+    )
+    assert config.storage_type == "CustomStorage"
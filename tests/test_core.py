@@ -1,62 +1,154 @@
-import shutil
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 import polars as pl
+import pyarrow.parquet as pq
 import pytest
-from sklearn.datasets import make_regression
+from deltalake import DeltaTable
 
 from timelake import TimeLake
-from timelake.constants import DATASETS_FOLDER
+from timelake.constants import DATASETS_FOLDER, StorageType
 from timelake.models import DatasetEntry
 
-PATH = Path("./timelake_tests")
 
+@pytest.fixture(scope="session")
+def lake_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Lives under pytest's base temp dir (point it at tmpfs with --basetemp)
+    return tmp_path_factory.mktemp("timelake_tests")
 
-# Fixture to handle cleanup after all tests
-@pytest.fixture(scope="session", autouse=True)
-def cleanup_timelake_path():
-    if PATH.exists():
-        shutil.rmtree(PATH)
 
-    # Yielding to the test
-    yield
+UPSERT_SCHEMA = {
+    "date": pl.Datetime,
+    **{f"feature_{i}": pl.Float64 for i in range(10)},
+}
 
-    if PATH.exists():
-        shutil.rmtree(PATH)
 
+@pytest.fixture(scope="module")
+def upsert_new_rows_df():
+    # Non-overlapping timestamps
+    return pl.DataFrame(
+        {
+            "date": [datetime(2023, 2, 1), datetime(2023, 2, 2)],
+            "feature_0": [1.0, 2.0],
+            "feature_1": [3.0, 4.0],
+            "feature_2": [5.0, 6.0],
+            "feature_3": [7.0, 8.0],
+            "feature_4": [9.0, 10.0],
+            "feature_5": [11.0, 12.0],
+            "feature_6": [13.0, 14.0],
+            "feature_7": [15.0, 16.0],
+            "feature_8": [17.0, 18.0],
+            "feature_9": [19.0, 20.0],
+        },
+        schema=UPSERT_SCHEMA,
+    )
+
+
+@pytest.fixture(scope="module")
+def upsert_updated_rows_df():
+    # Overlapping timestamps with updated values
+    return pl.DataFrame(
+        {
+            "date": [datetime(2023, 1, 1, 0, 0, 0), datetime(2023, 1, 1, 1, 0, 0)],
+            "feature_0": [999.0, 888.0],
+            "feature_1": [777.0, 666.0],
+            "feature_2": [555.0, 444.0],
+            "feature_3": [333.0, 222.0],
+            "feature_4": [111.0, 101.0],
+            "feature_5": [91.0, 81.0],
+            "feature_6": [71.0, 61.0],
+            "feature_7": [51.0, 41.0],
+            "feature_8": [31.0, 21.0],
+            "feature_9": [11.0, 1.0],
+        },
+        schema=UPSERT_SCHEMA,
+    )
 
-def create_sample_data():
-    n_hours = 24 * 30
-    n_features = 10
-    X, _ = make_regression(n_samples=n_hours, n_features=n_features)
-    timestamps = [datetime(2023, 1, 1) + timedelta(hours=i) for i in range(n_hours)]
 
+@pytest.fixture(scope="module")
+def upsert_mixed_rows_df():
+    # Both overlapping and non-overlapping timestamps
     return pl.DataFrame(
-        X, schema=[f"feature_{i}" for i in range(n_features)]
-    ).with_columns(pl.Series("date", timestamps))
+        {
+            "date": [
+                datetime(2023, 1, 1, 0, 0, 0),  # Existing row (to be updated)
+                datetime(2023, 2, 1, 0, 0, 0),  # New row (to be inserted)
+            ],
+            "feature_0": [555.0, 123.0],
+            "feature_1": [444.0, 456.0],
+            "feature_2": [333.0, 789.0],
+            "feature_3": [222.0, 101.0],
+            "feature_4": [111.0, 202.0],
+            "feature_5": [91.0, 303.0],
+            "feature_6": [71.0, 404.0],
+            "feature_7": [51.0, 505.0],
+            "feature_8": [31.0, 606.0],
+            "feature_9": [11.0, 707.0],
+        },
+        schema=UPSERT_SCHEMA,
+    )
 
 
-def test_create_timelake():
+@pytest.fixture(scope="module")
+def lake(lake_path):
+    # Opened lazily, so the first test requesting it runs after test_create_timelake
+    return TimeLake.open(path=lake_path)
+
+
+@pytest.fixture(scope="module")
+def prepared_dataset(sample_regression_df, lake):
+    # Created once and shared by the tests that only inspect an existing dataset
+    dataset_name = "prepared_dataset"
+    lake.create_dataset(name=dataset_name, df=sample_regression_df)
+    return dataset_name
+
+
+@pytest.fixture
+def make_string_partitioned_dataset(lake):
+    # Datasets written before day partitions became pl.Date store them as strings
+    def _make(name: str, df: pl.DataFrame) -> DatasetEntry:
+        partition_column = lake.config.timestamp_partition_column
+        processed_df = lake.preprocessor.run(df, lake.timestamp_column).with_columns(
+            pl.col(partition_column).cast(pl.String)
+        )
+        dataset = DatasetEntry(
+            name=name,
+            path=f"{lake.path}/{DATASETS_FOLDER}/{name}",
+            dataset_schema={
+                col: str(dtype) for col, dtype in processed_df.schema.items()
+            },
+            partition_columns=lake.config.partition_by,
+        )
+        processed_df.write_delta(
+            dataset.path,
+            delta_write_options={"partition_by": lake.config.partition_by},
+        )
+        lake.catalog.add_entry(dataset)
+        return dataset
+
+    return _make
+
+
+def test_create_timelake(lake_path):
     """Test creating a TimeLake without initial data"""
     lake = TimeLake.create(
-        path=PATH,
+        path=lake_path,
         timestamp_column="date",
     )
-    assert lake.path == str(PATH)
-    assert not (PATH / DATASETS_FOLDER).exists()  # No datasets folder created yet
+    assert lake.path == str(lake_path)
+    assert not (lake_path / DATASETS_FOLDER).exists()  # No datasets folder created yet
+    assert lake.config.storage_type == StorageType.LOCAL.value
 
 
-def test_create_dataset():
+def test_create_dataset(sample_regression_df, lake, lake_path):
     """Test explicit dataset creation"""
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+    df = sample_regression_df
 
     dataset_name = "test_dataset"
     lake.create_dataset(name=dataset_name, df=df)
 
     # Verify dataset was created in correct location
-    dataset_path = PATH / DATASETS_FOLDER / dataset_name
+    dataset_path = lake_path / DATASETS_FOLDER / dataset_name
     assert dataset_path.exists()
 
     # Verify dataset is readable
@@ -65,16 +157,15 @@ def test_create_dataset():
     assert dataset.name == dataset_name
 
 
-def test_write_to_new_dataset():
+def test_write_to_new_dataset(sample_regression_df, lake, lake_path):
     """Test writing to a new dataset creates it automatically"""
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+    df = sample_regression_df
 
     dataset_name = "write_dataset"
     lake.write(df=df, name=dataset_name)
 
     # Verify dataset was created
-    dataset_path = PATH / DATASETS_FOLDER / dataset_name
+    dataset_path = lake_path / DATASETS_FOLDER / dataset_name
     assert dataset_path.exists()
 
     # Verify data was written
@@ -82,16 +173,15 @@ def test_write_to_new_dataset():
     assert dataset is not None
 
 
-def test_upsert_to_new_dataset():
+def test_upsert_to_new_dataset(sample_regression_df, lake, lake_path):
     """Test upserting to a new dataset creates it automatically"""
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+    df = sample_regression_df
 
     dataset_name = "upsert_dataset"
     lake.upsert(df=df, name=dataset_name)
 
     # Verify dataset was created
-    dataset_path = PATH / DATASETS_FOLDER / dataset_name
+    dataset_path = lake_path / DATASETS_FOLDER / dataset_name
     assert dataset_path.exists()
 
     # Verify data was written
@@ -99,170 +189,180 @@ def test_upsert_to_new_dataset():
     assert dataset is not None
 
 
-def test_write_requires_dataset_name():
+def test_write_requires_dataset_name(sample_regression_df, lake):
     """Test that write operation requires a dataset name"""
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+    df = sample_regression_df
 
     with pytest.raises(TypeError):
         lake.write(df=df)  # Missing name parameter
 
 
-def test_dataset_in_correct_location():
-    """Test that datasets are created in the _timelake_datasets folder"""
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+def test_write_many(sample_regression_df, lake):
+    """Test writing several datasets in one call, new and existing"""
+    batches = {
+        "write_many_a": sample_regression_df,
+        "write_many_b": sample_regression_df,
+    }
+    lake.write_many(batches)
+    lake.write_many(batches)
 
-    dataset_name = "location_test"
-    lake.create_dataset(name=dataset_name, df=df)
+    # The first call creates each dataset, the second appends to it
+    for name in batches:
+        df = lake.read(dataset=name)
+        assert df.shape[0] == 2 * len(sample_regression_df)
+
+
+def test_buffered_writes(sample_regression_df, lake):
+    """Test that buffered frames are appended in a single commit"""
+    dataset_name = "test_buffered_writes"
+    lake.create_dataset(name=dataset_name, df=sample_regression_df)
+    version = lake._dataset_table(lake.get_dataset(dataset_name)).version()
+
+    with lake.buffered_writes(dataset_name, max_seconds=60) as writer:
+        for batch in sample_regression_df.iter_slices(100):
+            writer.write(batch)
+
+    dt = lake._dataset_table(lake.get_dataset(dataset_name))
+    assert dt.version() == version + 1
+    df = lake.read(dataset=dataset_name)
+    assert df.shape[0] == 2 * len(sample_regression_df)
+
+
+def test_empty_write_is_noop(sample_regression_df, lake):
+    """Test that empty writes and upserts return without touching the lake"""
+    empty_df = sample_regression_df.clear()
+    lake.write(empty_df, name="test_empty_write")
+    lake.upsert(empty_df, name="test_empty_write")
+    assert lake.get_dataset("test_empty_write") is None
 
+
+def test_write_maintenance(sample_regression_df, lake_path):
+    """Test that a dataset is compacted and checkpointed every N writes"""
+    lake = TimeLake.open(path=lake_path, maintenance_every_writes=2)
+    dataset_name = "test_write_maintenance"
+    lake.create_dataset(name=dataset_name, df=sample_regression_df)
+    log_dir = lake_path / DATASETS_FOLDER / dataset_name / "_delta_log"
+
+    lake.write(sample_regression_df, name=dataset_name)
+    assert not (log_dir / "_last_checkpoint").exists()
+
+    lake.write(sample_regression_df, name=dataset_name)
+    assert (log_dir / "_last_checkpoint").exists()
+    df = lake.read(dataset=dataset_name)
+    assert df.shape[0] == 3 * len(sample_regression_df)
+
+
+def test_dataset_in_correct_location(lake, prepared_dataset, lake_path):
+    """Test that datasets are created in the _timelake_datasets folder"""
     # Verify correct path structure
-    expected_path = PATH / DATASETS_FOLDER / dataset_name
-    dataset = lake.get_dataset(dataset_name)
+    expected_path = lake_path / DATASETS_FOLDER / prepared_dataset
+    dataset = lake.get_dataset(prepared_dataset)
     assert Path(dataset.path) == expected_path
 
 
-def test_write_timelake():
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+def test_write_timelake(sample_regression_df, lake):
+    df = sample_regression_df
     lake.write(df, name="test_write")
 
     # Verify data was written
     dataset = lake.get_dataset("test_write")
     assert dataset is not None
+    # The first write to a dataset stores its rows once
+    assert lake.read(dataset="test_write").shape[0] == len(df)
 
 
-def test_read_timelake():
-    lake = TimeLake.open(path=PATH)
-    df = lake.read(dataset="test_write")
-    assert df is not None
-    assert df.shape[1] == 13  # 10 features + 1 inserted_at, date, date_day column
+def test_write_compression(lake, lake_path):
+    """Test that dataset files use the configured Parquet codec"""
+    dataset_path = lake_path / DATASETS_FOLDER / "test_write"
+    parquet_file = next(dataset_path.rglob("*.parquet"))
+    column = pq.ParquetFile(parquet_file).metadata.row_group(0).column(0)
+    assert column.compression == lake.config.parquet_compression
 
 
-def test_read_with_date_range():
-    lake = TimeLake.open(path=PATH)
-    df = lake.read(dataset="test_write", start_date="2023-01-01", end_date="2023-01-02")
-    # We get the latest inserted_at date since we inserted twice from the previous tests (meaning that we have 96 rows)
-    df = df.filter(pl.col("inserted_at") == df["inserted_at"].max())
-    assert df.shape[0] == 48  # 48 hours in the range, end_date is inclusive
-    assert df["date"].min() >= datetime(2023, 1, 1, 0, 0, 0)
-    assert df["date"].max() <= datetime(2023, 1, 2, 23, 59, 59)
-
+def test_read_timelake(lake):
+    schema = lake.read(dataset="test_write", lazy=True).collect_schema()
+    assert schema.len() == 13  # 10 features + 1 inserted_at, date, date_day column
 
-def test_duplicate_inserts():
-    tests_insert_count = 0  # Note: Check why this is reset, we already inserted twice in the previous tests
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
-    lake.write(df, name="test_duplicate_inserts")
-    lake.write(df, name="test_duplicate_inserts")  # Duplicate insert
-    # Verify data was written
-    dataset = lake.get_dataset("test_duplicate_inserts")
-    assert dataset is not None
-    tests_insert_count += 2  # we inserted two more times in this test
-    df = lake.read(dataset="test_write")
-    assert df.shape[0] == int(tests_insert_count) * len(create_sample_data())
 
+def test_read_columns(lake):
+    df = lake.read(dataset="test_write", columns=["date", "feature_0"])
+    assert df.columns == ["date", "feature_0"]
 
-def test_upsert_insert_new_rows():
-    """
-    Test that the upsert method inserts new rows when no matching timestamp exists.
-    """
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
 
-    # Create a new DataFrame with non-overlapping timestamps
-    new_data = pl.DataFrame(
-        {
-            "date": [datetime(2023, 2, 1), datetime(2023, 2, 2)],
-            "feature_0": [1.0, 2.0],
-            "feature_1": [3.0, 4.0],
-            "feature_2": [5.0, 6.0],
-            "feature_3": [7.0, 8.0],
-            "feature_4": [9.0, 10.0],
-            "feature_5": [11.0, 12.0],
-            "feature_6": [13.0, 14.0],
-            "feature_7": [15.0, 16.0],
-            "feature_8": [17.0, 18.0],
-            "feature_9": [19.0, 20.0],
-        }
+def test_iter_batches(lake):
+    batches = list(
+        lake.iter_batches(
+            dataset="test_write",
+            start_date="2023-01-01",
+            end_date="2023-01-02",
+            columns=["date", "feature_0"],
+            batch_size=10,
+        )
     )
+    df = pl.concat(batches)
+    assert all(len(batch) <= 10 for batch in batches)
+    assert df.columns == ["date", "feature_0"]
+    assert df.shape[0] == 48  # 48 hours in the range, end_date is inclusive
 
-    # Perform upsert
-    lake.upsert(new_data, name="test_write")
 
-    # Read data and verify new rows are inserted
-    df = lake.read(dataset="test_write")
-    assert df.filter(pl.col("date") == datetime(2023, 2, 1)).shape[0] == 1
-    assert df.filter(pl.col("date") == datetime(2023, 2, 2)).shape[0] == 1
+def test_iter_batches_string_partitions(
+    sample_regression_df, lake, make_string_partitioned_dataset
+):
+    make_string_partitioned_dataset("test_batches_string", sample_regression_df)
+    batches = lake.iter_batches(
+        dataset="test_batches_string", start_date="2023-01-01", end_date="2023-01-02"
+    )
+    assert sum(len(batch) for batch in batches) == 48
 
 
-def test_upsert_update_existing_rows():
-    """
-    Test that the upsert method updates existing rows when matching timestamps exist.
-    """
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+def test_read_with_date_range(lake):
+    lf = lake.read(
+        dataset="test_write", start_date="2023-01-01", end_date="2023-01-02", lazy=True
+    )
+    df = lf.collect()
+    assert df.shape[0] == 48  # 48 hours in the range, end_date is inclusive
+    assert df["date"].min() >= datetime(2023, 1, 1, 0, 0, 0)
+    assert df["date"].max() <= datetime(2023, 1, 2, 23, 59, 59)
 
-    # Create a new DataFrame with overlapping timestamps
-    updated_data = pl.DataFrame(
-        {
-            "date": [datetime(2023, 1, 1, 0, 0, 0), datetime(2023, 1, 1, 1, 0, 0)],
-            "feature_0": [999.0, 888.0],  # Updated values
-            "feature_1": [777.0, 666.0],
-            "feature_2": [555.0, 444.0],
-            "feature_3": [333.0, 222.0],
-            "feature_4": [111.0, 101.0],
-            "feature_5": [91.0, 81.0],
-            "feature_6": [71.0, 61.0],
-            "feature_7": [51.0, 41.0],
-            "feature_8": [31.0, 21.0],
-            "feature_9": [11.0, 1.0],
-        }
+
+def test_read_with_date_range_string_partitions(
+    sample_regression_df, lake, make_string_partitioned_dataset
+):
+    make_string_partitioned_dataset("test_string_partitions", sample_regression_df)
+    df = lake.read(
+        dataset="test_string_partitions",
+        start_date="2023-01-01",
+        end_date="2023-01-02",
     )
+    assert df.shape[0] == 48  # 48 hours in the range, end_date is inclusive
 
-    # Perform upsert
-    lake.upsert(updated_data, name="test_write")
 
-    # Read data and verify rows are updated
-    df = lake.read(dataset="test_write")
-    updated_row = df.filter(pl.col("date") == datetime(2023, 1, 1, 0, 0, 0))
-    assert updated_row["feature_0"][0] == 999.0
-    assert updated_row["feature_1"][0] == 777.0
+def test_duplicate_inserts(sample_regression_df, lake):
+    df = sample_regression_df
+    # Duplicate insert, batched into a single write/commit
+    lake.write(pl.concat([df, df]), name="test_duplicate_inserts")
+    # Verify data was written
+    dataset = lake.get_dataset("test_duplicate_inserts")
+    assert dataset is not None
+    # Duplicate rows are kept as written
+    assert lake.read(dataset="test_duplicate_inserts").shape[0] == 2 * len(df)
 
 
-def test_upsert_mixed_insert_and_update():
-    """
-    Test that the upsert method handles both inserting new rows and updating existing rows.
-    """
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+def check_upsert_new_rows(df: pl.DataFrame):
+    """New rows are inserted when no matching timestamp exists."""
+    assert df.filter(pl.col("date") == datetime(2023, 2, 1)).shape[0] == 1
+    assert df.filter(pl.col("date") == datetime(2023, 2, 2)).shape[0] == 1
 
-    # Create a new DataFrame with both overlapping and non-overlapping timestamps
-    mixed_data = pl.DataFrame(
-        {
-            "date": [
-                datetime(2023, 1, 1, 0, 0, 0),  # Existing row (to be updated)
-                datetime(2023, 2, 1, 0, 0, 0),  # New row (to be inserted)
-            ],
-            "feature_0": [555.0, 123.0],
-            "feature_1": [444.0, 456.0],
-            "feature_2": [333.0, 789.0],
-            "feature_3": [222.0, 101.0],
-            "feature_4": [111.0, 202.0],
-            "feature_5": [91.0, 303.0],
-            "feature_6": [71.0, 404.0],
-            "feature_7": [51.0, 505.0],
-            "feature_8": [31.0, 606.0],
-            "feature_9": [11.0, 707.0],
-        }
-    )
 
-    # Perform upsert
-    lake.upsert(mixed_data, name="test_write")
+def check_upsert_updated_rows(df: pl.DataFrame):
+    """Existing rows are updated when matching timestamps exist."""
+    updated_row = df.filter(pl.col("date") == datetime(2023, 1, 1, 0, 0, 0))
+    assert updated_row["feature_0"][0] == 999.0
+    assert updated_row["feature_1"][0] == 777.0
 
-    # Read data and verify both update and insert
-    df = lake.read(dataset="test_write")
 
+def check_upsert_mixed_rows(df: pl.DataFrame):
+    """Both inserting new rows and updating existing rows are handled."""
     # Verify updated row
     updated_row = df.filter(pl.col("date") == datetime(2023, 1, 1, 0, 0, 0))
     assert updated_row["feature_0"][0] == 555.0
@@ -275,33 +375,127 @@ def test_upsert_mixed_insert_and_update():
     assert inserted_row["feature_1"][0] == 456.0
 
 
-def test_get_dataset():
-    """Test getting dataset by name"""
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+@pytest.mark.parametrize(
+    "payload_fixture,check",
+    [
+        ("upsert_new_rows_df", check_upsert_new_rows),
+        ("upsert_updated_rows_df", check_upsert_updated_rows),
+        ("upsert_mixed_rows_df", check_upsert_mixed_rows),
+    ],
+    ids=["insert_new_rows", "update_existing_rows", "mixed_insert_and_update"],
+)
+def test_upsert(request, lake, payload_fixture, check):
+    """
+    Test that the upsert method inserts new rows and updates existing rows.
+    Cases run in order against the same dataset.
+    """
+    # Perform upsert
+    lake.upsert(request.getfixturevalue(payload_fixture), name="test_write")
+
+    # Read data and verify
+    check(lake.read(dataset="test_write"))
+
+
+@pytest.mark.parametrize("case", ["naive", "tz_aware", "string_partitions"])
+def test_upsert_delete_append(
+    case,
+    sample_regression_df,
+    lake,
+    upsert_mixed_rows_df,
+    make_string_partitioned_dataset,
+):
+    """Test that the delete_append strategy matches merge semantics"""
+    dataset_name = f"test_delete_append_{case}"
+    df, payload = sample_regression_df, upsert_mixed_rows_df
+    if case == "tz_aware":
+        to_local = pl.col("date").dt.replace_time_zone("Europe/Copenhagen")
+        df, payload = df.with_columns(to_local), payload.with_columns(to_local)
+    if case == "string_partitions":
+        dataset = make_string_partitioned_dataset(dataset_name, df)
+    else:
+        dataset = lake.create_dataset(name=dataset_name, df=df)
+
+    version = DeltaTable(dataset.path).version()
+    lake.upsert(payload, name=dataset_name, upsert_strategy="delete_append")
+    # Rows are replaced in a single commit
+    assert DeltaTable(dataset.path).version() == version + 1
+
+    result = lake.read(dataset=dataset_name)
+    if case == "tz_aware":
+        # Stored as UTC; compare in the local wall-clock time that was written
+        result = result.with_columns(
+            pl.col("date")
+            .dt.convert_time_zone("Europe/Copenhagen")
+            .dt.replace_time_zone(None)
+        )
+    assert result.shape[0] == len(df) + 1  # one updated, one inserted
+    check_upsert_mixed_rows(result)
+
+
+def test_optimize_dataset(lake):
+    """Test that partition columns are dropped from the Z-order columns"""
+    metrics = lake.optimize(
+        dataset="test_write", zorder_by=[lake.config.timestamp_partition_column]
+    )
+    # Only partition columns requested, so this falls back to plain compaction
+    assert "numFilesAdded" in metrics
 
-    dataset_name = "test_dataset"
-    lake.create_dataset(name=dataset_name, df=df)
+    metrics = lake.optimize(
+        dataset="test_write",
+        zorder_by=[lake.config.timestamp_partition_column, "feature_0"],
+    )
+    assert "numFilesAdded" in metrics
+
+    df = lake.read(dataset="test_write")
+    inserted_row = df.filter(pl.col("date") == datetime(2023, 2, 1, 0, 0, 0))
+    assert inserted_row.shape[0] == 1
+
+
+def test_refresh_storage_options(lake, prepared_dataset, monkeypatch):
+    rotated = {"timeout": "120s"}
+    monkeypatch.setattr(
+        type(lake.storage), "reload_storage_options", lambda self: rotated
+    )
+    lake.refresh_storage_options()
+
+    # The catalog picks up the new options and reopens its table with them
+    assert lake.catalog.storage_options is rotated
+    assert lake.catalog._dt is None
+    assert lake.get_dataset(prepared_dataset) is not None
+
+    # Put the shared lake back on its real options
+    monkeypatch.undo()
+    lake.refresh_storage_options()
 
+
+def test_get_dataset(lake, prepared_dataset):
+    """Test getting dataset by name"""
     # Get dataset by name
-    dataset = lake.get_dataset(dataset_name)
+    dataset = lake.get_dataset(prepared_dataset)
     assert dataset is not None
-    assert dataset.name == dataset_name
+    assert dataset.name == prepared_dataset
     assert isinstance(dataset, DatasetEntry)
 
+    # Repeated lookups are served from the catalog cache
+    assert lake.get_dataset(prepared_dataset) is dataset
+
     # Test non-existent dataset
     assert lake.get_dataset("non_existent") is None
 
 
-def test_create_dataset_with_partitions():
-    """Test that datasets are created with partition columns from the TimeLake config"""
-    df = create_sample_data()
-    lake = TimeLake.open(path=PATH)
+def test_get_dataset_after_delete(sample_regression_df, lake):
+    """Test that a deleted dataset is no longer returned"""
+    lake.create_dataset(name="test_get_deleted", df=sample_regression_df)
+    assert lake.get_dataset("test_get_deleted") is not None
+
+    # The catalog commit invalidates the cached entry
+    assert lake.catalog.delete_entry("test_get_deleted")
+    assert lake.get_dataset("test_get_deleted") is None
 
-    dataset_name = "partitioned_dataset"
-    lake.create_dataset(name=dataset_name, df=df)
 
+def test_create_dataset_with_partitions(lake, prepared_dataset):
+    """Test that datasets are created with partition columns from the TimeLake config"""
     # Verify dataset was created with correct partition columns
-    dataset = lake.get_dataset(dataset_name)
+    dataset = lake.get_dataset(prepared_dataset)
     assert dataset is not None
     assert dataset.partition_columns == lake.config.partition_by
@@ -7,6 +7,12 @@ from timelake.constants import TimeLakeColumns
 from timelake.preprocessor import TimeLakePreprocessor
 
 
+@pytest.fixture(scope="module")
+def preprocessor():
+    # The preprocessor holds no state between runs, so one instance serves all tests
+    return TimeLakePreprocessor()
+
+
 @pytest.fixture
 def sample_df():
     return pl.DataFrame(
@@ -14,97 +20,115 @@ def sample_df():
             "date": [datetime(2024, 1, 1), datetime(2024, 1, 2)],
             "asset_id": ["AAPL", "MSFT"],
             "price": [150, 300],
-        }
+        },
+        schema={"date": pl.Datetime, "asset_id": pl.String, "price": pl.Int64},
     )
 
 
-def test_validate_dataframe_success(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_validate_dataframe_success(preprocessor, sample_df):
     # Should not raise any exceptions
     preprocessor.validate_dataframe(sample_df, "date")
 
 
-def test_validate_dataframe_empty_df():
-    preprocessor = TimeLakePreprocessor()
+def test_validate_dataframe_empty_df(preprocessor):
     df = pl.DataFrame(schema={"date": pl.Datetime, "asset_id": pl.String})
     with pytest.raises(ValueError, match="DataFrame is empty."):
         preprocessor.validate_dataframe(df, "date")
 
 
-def test_validate_dataframe_missing_timestamp(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_validate_dataframe_missing_timestamp(preprocessor, sample_df):
     with pytest.raises(ValueError, match="Timestamp column 'missing_ts' is missing."):
         preprocessor.validate_dataframe(sample_df, "missing_ts")
 
 
-def test_validate_partitions_success(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_validate_dataframe_lazy(preprocessor, sample_df):
+    # Should not raise any exceptions
+    preprocessor.validate_dataframe(sample_df.lazy(), "date")
+    with pytest.raises(ValueError, match="DataFrame is empty."):
+        preprocessor.validate_dataframe(sample_df.lazy().limit(0), "date")
+
+
+def test_validate_partitions_lazy(preprocessor, sample_df):
+    # Should not raise any exceptions
+    preprocessor.validate_partitions(sample_df.lazy(), ["date", "asset_id"])
+    preprocessor.validate_partitions(sample_df.schema, ["date", "asset_id"])
+    with pytest.raises(ValueError, match="Partition column 'missing_col' is missing."):
+        preprocessor.validate_partitions(sample_df.lazy(), ["date", "missing_col"])
+
+
+def test_validate_partitions_success(preprocessor, sample_df):
     # Should not raise any exceptions
     preprocessor.validate_partitions(sample_df, ["date", "asset_id"])
 
 
-def test_validate_partitions_missing_column(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_validate_partitions_missing_column(preprocessor, sample_df):
     with pytest.raises(ValueError, match="Partition column 'missing_col' is missing."):
         preprocessor.validate_partitions(sample_df, ["date", "missing_col"])
 
 
-def test_validate_partitions_empty():
-    preprocessor = TimeLakePreprocessor()
+def test_validate_partitions_missing_columns(preprocessor, sample_df):
+    with pytest.raises(
+        ValueError, match="Partition columns 'missing_a', 'missing_b' are missing."
+    ):
+        preprocessor.validate_partitions(sample_df, ["missing_a", "date", "missing_b"])
+
+
+def test_validate_partitions_empty(preprocessor):
     with pytest.raises(ValueError, match="Partition columns are empty."):
         preprocessor.validate_partitions(pl.DataFrame(), [])
 
 
-def test_validate_partitions_duplicate_columns(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_validate_partitions_duplicate_columns(preprocessor, sample_df):
     with pytest.raises(ValueError, match="Partition columns must be unique."):
         preprocessor.validate_partitions(sample_df, ["date", "date"])
 
 
-def test_run_success(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_run_success(preprocessor, sample_df):
     processed_df = preprocessor.run(sample_df, "date")
     assert "date_day" in processed_df.columns  # Default partition column
     assert TimeLakeColumns.INSERTED_AT.value in processed_df.columns
-    assert processed_df.schema["date_day"] == pl.Utf8  # Partition column is a string
+    assert processed_df.schema["date_day"] == pl.Date  # Partition column is a date
     assert (
         processed_df.schema[TimeLakeColumns.INSERTED_AT.value] == pl.Datetime
     )  # Inserted at is datetime
 
 
-def test_run_invalid_dataframe():
-    preprocessor = TimeLakePreprocessor()
+def test_run_invalid_dataframe(preprocessor):
     df = pl.DataFrame(schema={"date": pl.Datetime, "asset_id": pl.String})
     with pytest.raises(ValueError, match="DataFrame is empty."):
         preprocessor.run(df, "date")
 
 
-def test_run_missing_timestamp(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_run_missing_timestamp(preprocessor, sample_df):
     with pytest.raises(ValueError, match="Timestamp column 'missing_ts' is missing."):
         preprocessor.run(sample_df, "missing_ts")
 
 
-def test_inserted_at_is_datetime(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_inserted_at_is_datetime(preprocessor, sample_df):
     processed_df = preprocessor.add_inserted_at_column(sample_df)
     assert TimeLakeColumns.INSERTED_AT.value in processed_df.columns
     assert processed_df.schema[TimeLakeColumns.INSERTED_AT.value] == pl.Datetime
+    assert processed_df[TimeLakeColumns.INSERTED_AT.value].n_unique() == 1
 
 
-def test_timestamp_partition_is_string(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_timestamp_partition_is_date(preprocessor, sample_df):
     processed_df = preprocessor.enrich_partitions(sample_df, "date")
     partition_column = preprocessor.get_timestamp_partition_column("date")
     assert partition_column in processed_df.columns
-    assert processed_df.schema[partition_column] == pl.Utf8  # Ensure it's a string
+    assert processed_df.schema[partition_column] == pl.Date  # Ensure it's a date
 
 
-def test_prepare_data_adds_correct_columns(sample_df):
-    preprocessor = TimeLakePreprocessor()
+def test_prepare_data_adds_correct_columns(preprocessor, sample_df):
     processed_df = preprocessor.prepare_data(sample_df, "date")
     assert TimeLakeColumns.INSERTED_AT.value in processed_df.columns
     assert processed_df.schema[TimeLakeColumns.INSERTED_AT.value] == pl.Datetime
     partition_column = preprocessor.get_timestamp_partition_column("date")
     assert partition_column in processed_df.columns
-    assert processed_df.schema[partition_column] == pl.Utf8  # Ensure it's a string
+    assert processed_df.schema[partition_column] == pl.Date  # Ensure it's a date
+
+
+def test_prepare_data_lazy(preprocessor, sample_df):
+    lf = preprocessor.prepare_data(sample_df.lazy(), "date")
+    assert isinstance(lf, pl.LazyFrame)
+    expected = preprocessor.prepare_data(sample_df, "date")
+    assert lf.collect_schema() == expected.schema
@@ -1,29 +1,20 @@
 import os
-import shutil
-from pathlib import Path
 
 import pytest
 
-from timelake.storage import LocalTimeLakeStorage, S3TimeLakeStorage
+from timelake.constants import StorageType
+from timelake.storage import LocalTimeLakeStorage, S3TimeLakeStorage, TimeLakeStorage
 
-TEST_PATH = Path("./timelake_storage_test")
 S3_TEST_PATH = "s3://test-bucket/timelake_storage_test"
 
 
 @pytest.fixture(scope="module")
-def local_storage():
-    # Setup: clean directory before test
-    if TEST_PATH.exists():
-        shutil.rmtree(TEST_PATH)
-
-    storage = LocalTimeLakeStorage(TEST_PATH)
+def local_storage(tmp_path_factory: pytest.TempPathFactory):
+    # Setup: fresh directory under pytest's base temp dir
+    storage = LocalTimeLakeStorage(tmp_path_factory.mktemp("timelake_storage_test"))
     storage.ensure_directories()
 
-    yield storage  # Yield to the test functions
-
-    # Teardown: clean up after test
-    if TEST_PATH.exists():
-        shutil.rmtree(TEST_PATH)
+    return storage
 
 
 @pytest.fixture(scope="module")
@@ -41,9 +32,28 @@ def s3_storage():
 
 
 def test_ensure_directories_local(local_storage: LocalTimeLakeStorage):
+    assert isinstance(local_storage.path, str)
     assert os.path.exists(local_storage.path)
 
 
+def test_ensure_directories_local_cached(tmp_path, monkeypatch):
+    storage = LocalTimeLakeStorage(tmp_path / "cached")
+    storage.ensure_directories()
+    assert os.path.exists(storage.path)
+
+    # A new handle re-creates a directory removed after it was verified
+    os.rmdir(storage.path)
+    LocalTimeLakeStorage(tmp_path / "cached").ensure_directories()
+    assert os.path.exists(storage.path)
+
+    # A handle that verified its path does not create it again
+    def fail_makedirs(*args, **kwargs):
+        raise AssertionError("makedirs called for a verified path")
+
+    monkeypatch.setattr(os, "makedirs", fail_makedirs)
+    storage.ensure_directories()
+
+
 def test_ensure_directories_s3(s3_storage: S3TimeLakeStorage):
     # Placeholder: Validate S3 directories (mocked for now)
     assert s3_storage.path == S3_TEST_PATH
@@ -52,3 +62,52 @@ def test_ensure_directories_s3(s3_storage: S3TimeLakeStorage):
 def test_get_storage_options_local(local_storage: LocalTimeLakeStorage):
     options = local_storage.get_storage_options()
     assert options == {}
+
+
+def test_get_storage_options_s3(monkeypatch):
+    credentials = {
+        "AWS_REGION": "test-region",
+        "AWS_ACCESS_KEY_ID": "test-key-id",
+        "AWS_SECRET_ACCESS_KEY": "test-secret",
+    }
+    for var, value in credentials.items():
+        monkeypatch.setenv(var, value)
+    storage = S3TimeLakeStorage(S3_TEST_PATH)
+    options = storage.get_storage_options()
+    assert options == credentials
+
+    # Options are read once and only re-read on reload
+    monkeypatch.setenv("AWS_REGION", "rotated-region")
+    assert storage.get_storage_options() is options
+    assert storage.reload_storage_options()["AWS_REGION"] == "rotated-region"
+
+
+@pytest.mark.parametrize(
+    "path, bucket",
+    [("s3://bucket/some/prefix", "bucket"), ("s3://bucket", "bucket")],
+)
+def test_extract_bucket_name(path: str, bucket: str):
+    assert S3TimeLakeStorage._extract_bucket_name(path) == bucket
+
+
+@pytest.mark.parametrize("path", ["s3:///prefix", "bucket/prefix"])
+def test_extract_bucket_name_invalid(path: str):
+    with pytest.raises(ValueError):
+        S3TimeLakeStorage._extract_bucket_name(path)
+
+
+def test_create_storage(tmp_path):
+    storage = TimeLakeStorage.create_storage(StorageType.LOCAL, tmp_path)
+    assert isinstance(storage, LocalTimeLakeStorage)
+
+    # Local storage accepts and ignores backend kwargs
+    storage = TimeLakeStorage.create_storage(StorageType.LOCAL, tmp_path, timeout=5)
+    assert isinstance(storage, LocalTimeLakeStorage)
+
+    with pytest.raises(ValueError):
+        TimeLakeStorage.create_storage("unknown", tmp_path)
+
+
+def test_storage_slots(local_storage: LocalTimeLakeStorage):
+    # Storage handles have no per-instance __dict__
+    assert not hasattr(local_storage, "__dict__")
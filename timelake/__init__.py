@@ -1,11 +1,15 @@
+from typing import TYPE_CHECKING
+
 from timelake.base import (
     BaseTimeLake,
     BaseTimeLakePreprocessor,
     BaseTimeLakeStorage,
 )
-from timelake.catalog import TimeLakeCatalog
 from timelake.constants import StorageType
-from timelake.core import TimeLake
+
+if TYPE_CHECKING:
+    from timelake.catalog import TimeLakeCatalog
+    from timelake.core import TimeLake
 
 __all__ = [
     "BaseTimeLake",
@@ -15,3 +19,16 @@ __all__ = [
     "StorageType",
     "TimeLakeCatalog",
 ]
+
+
+def __getattr__(name: str):
+    # Defer the polars/deltalake imports until the engine classes are used
+    if name == "TimeLake":
+        from timelake.core import TimeLake
+
+        return TimeLake
+    if name == "TimeLakeCatalog":
+        from timelake.catalog import TimeLakeCatalog
+
+        return TimeLakeCatalog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,16 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
-
-import polars as pl
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
+from timelake.constants import StorageType
 from timelake.models import BaseCatalogEntry, TimeLakeEntry
 
+if TYPE_CHECKING:
+    # Only needed for annotations; keeps `import timelake` free of polars
+    import polars as pl
+
 
 class BaseTimeLakeCatalog(ABC):
     """Base class for TimeLake catalog implementations."""
@@ -38,6 +43,13 @@ class BaseTimeLakeCatalog(ABC):
         """Get an entry from the catalog by name and type."""
         pass
 
+    @abstractmethod
+    def get_entries_by_names(
+        self, names: List[str], entry_type: str
+    ) -> Dict[str, BaseCatalogEntry]:
+        """Get the entries of the given names and type, keyed by name."""
+        pass
+
     @abstractmethod
     def list_entries(self, entry_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """List all entries in the catalog, optionally filtered by type."""
@@ -141,7 +153,11 @@ class BaseTimeLake(ABC):
 
 
 class BaseTimeLakeStorage(ABC):
+    __slots__ = ()
+
     path: str
+    # None for storages outside StorageType; they are recorded by class name
+    storage_type: Optional[StorageType] = None
 
     @staticmethod
     @abstractmethod
@@ -160,14 +176,20 @@ class BaseTimeLakeStorage(ABC):
         """Return storage-specific options for integration with Polars."""
         pass
 
+    def reload_storage_options(self) -> dict:
+        """Re-read storage options that may have changed, e.g. rotated credentials."""
+        return self.get_storage_options()
+
 
 class BaseTimeLakePreprocessor(ABC):
     @abstractmethod
-    def validate_dataframe(self, df: pl.DataFrame, timestamp_column: str) -> None: ...
+    def validate_dataframe(
+        self, df: pl.DataFrame | pl.LazyFrame, timestamp_column: str
+    ) -> None: ...
 
     @abstractmethod
     def validate_partitions(
-        self, df: pl.DataFrame, partition_by: List[str]
+        self, df: pl.DataFrame | pl.LazyFrame | pl.Schema, partition_by: List[str]
     ) -> None: ...
 
     @abstractmethod
@@ -177,15 +199,19 @@ class BaseTimeLakePreprocessor(ABC):
     def get_default_partitions(self, timestamp_column: str) -> List[str]: ...
 
     @abstractmethod
-    def add_inserted_at_column(self, df: pl.DataFrame) -> pl.DataFrame: ...
+    def add_inserted_at_column(
+        self, df: pl.DataFrame | pl.LazyFrame
+    ) -> pl.DataFrame | pl.LazyFrame: ...
 
     @abstractmethod
     def enrich_partitions(
-        self, df: pl.DataFrame, timestamp_column: str
-    ) -> pl.DataFrame: ...
+        self, df: pl.DataFrame | pl.LazyFrame, timestamp_column: str
+    ) -> pl.DataFrame | pl.LazyFrame: ...
 
     @abstractmethod
-    def prepare_data(self, df: pl.DataFrame, timestamp_column: str) -> pl.DataFrame: ...
+    def prepare_data(
+        self, df: pl.DataFrame | pl.LazyFrame, timestamp_column: str
+    ) -> pl.DataFrame | pl.LazyFrame: ...
 
     @abstractmethod
     def run(
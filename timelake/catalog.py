@@ -1,19 +1,25 @@
-import json
+import asyncio
 import os
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import orjson
 import polars as pl
-from deltalake import DeltaTable, write_deltalake
+import pyarrow as pa
+from deltalake import DeltaTable, WriterProperties, write_deltalake
 
 from timelake.base import (
     BaseTimeLakeCatalog,
     BaseTimeLakePreprocessor,
     BaseTimeLakeStorage,
 )
-from timelake.constants import CATALOG_TABLE_NAME, CatalogEntryType
+from timelake.constants import (
+    CATALOG_CHECKPOINT_INTERVAL,
+    CATALOG_TABLE_NAME,
+    CatalogEntryType,
+)
 from timelake.models import (
     BaseCatalogEntry,
     DatasetEntry,
@@ -26,6 +32,23 @@ ENTRY_TYPE_TO_MODEL = {
     CatalogEntryType.DATASET.value: DatasetEntry,
 }
 
+# Arrow layout of a catalog row, used for single-entry appends
+CATALOG_ARROW_SCHEMA = pa.schema(
+    [
+        ("id", pa.large_string()),
+        ("name", pa.large_string()),
+        ("entry_type", pa.large_string()),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+        ("properties", pa.large_string()),
+    ]
+)
+
+# Latest TimeLake config per catalog path, shared by every catalog instance in the
+# process so reopening an unchanged lake skips the config scan. Keyed on the Delta
+# table id as well as its version, so a lake recreated at the same path is reread
+_TIMELAKE_CONFIGS: Dict[str, Tuple[str, int, Optional[TimeLakeEntry]]] = {}
+
 
 class TimeLakeCatalog(BaseTimeLakeCatalog):
     """
@@ -45,6 +68,13 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
         self.catalog_path = f"{path}/{CATALOG_TABLE_NAME}"
         self.storage_options = storage_options or {}
 
+        # Lookup results cached against the catalog table version they were read at
+        self._cache: Dict[Tuple, Any] = {}
+        self._cache_version: Optional[int] = None
+
+        # Opened lazily and refreshed incrementally instead of replaying the log
+        self._dt: Optional[DeltaTable] = None
+
     @classmethod
     def create_catalog(
         cls, path: str, storage_options: Optional[Dict[str, Any]] = None
@@ -71,7 +101,7 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
     def _catalog_exists(self) -> bool:
         """Check if the catalog exists."""
         try:
-            DeltaTable(self.catalog_path, storage_options=self.storage_options)
+            self._table()
             return True
         except Exception:
             return False
@@ -111,57 +141,173 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
             key: entry_dict.pop(key)
             for key in ["id", "name", "entry_type", "created_at", "updated_at"]
         }
-        catalog_entry = {**core_fields, "properties": json.dumps(entry_dict)}
+        catalog_entry = {**core_fields, "properties": orjson.dumps(entry_dict).decode()}
 
-        # Append the new entry to the catalog
-        entry_df = pl.DataFrame([catalog_entry])
-        dt = DeltaTable(self.catalog_path, storage_options=self.storage_options)
-        try:
-            catalog_df = pl.read_delta(dt)
-            catalog_df = pl.concat([catalog_df, entry_df])
-        except Exception:
-            catalog_df = entry_df
-
-        # Write back to the catalog
-        catalog_df.write_delta(
+        # Append the new entry to the catalog; the table always exists since
+        # create_catalog/open_catalog guarantee it. Schema differences are merged
+        # by the Delta writer instead of reconciling with the existing rows here.
+        # A single row goes straight in as an Arrow batch, without a DataFrame
+        batch = pa.RecordBatch.from_pylist([catalog_entry], schema=CATALOG_ARROW_SCHEMA)
+        write_deltalake(
             self.catalog_path,
-            mode="overwrite",
+            batch,
+            mode="append",
+            schema_mode="merge",
             storage_options=self.storage_options,
         )
+        self._committed()
         return entry.id
 
+    def _table(self) -> DeltaTable:
+        """
+        Return the catalog table handle, fetching only log entries added since the
+        last call.
+        """
+        if self._dt is None:
+            self._dt = DeltaTable(
+                self.catalog_path, storage_options=self.storage_options
+            )
+        else:
+            self._dt.update_incremental()
+        return self._dt
+
+    def set_storage_options(self, storage_options: Optional[Dict[str, Any]]) -> None:
+        """
+        Replace the storage options, e.g. after credentials were rotated. The
+        cached table handle holds the old options, so it is reopened on next use.
+        """
+        self.storage_options = storage_options or {}
+        self._dt = None
+
+    def _committed(self) -> None:
+        """
+        Invalidate cached lookups after a catalog write and checkpoint the table
+        every CATALOG_CHECKPOINT_INTERVAL versions, so opening it reads one
+        checkpoint plus a short log tail instead of replaying the whole log.
+        """
+        self._cache.clear()
+        # Decided from the table version, so commits from short-lived catalog
+        # instances still add up to a checkpoint
+        dt = self._table()
+        if dt.version() % CATALOG_CHECKPOINT_INTERVAL == 0:
+            dt.create_checkpoint()
+
+    def _cached(self, key: Tuple, loader: Callable[[DeltaTable], Any]) -> Any:
+        """
+        Serve a lookup from the cache while the catalog table version is unchanged,
+        otherwise load it from the catalog table.
+        """
+        dt = self._table()
+        version = dt.version()
+        if version != self._cache_version:
+            self._cache.clear()
+            self._cache_version = version
+        if key not in self._cache:
+            self._cache[key] = loader(dt)
+        return self._cache[key]
+
     def _parse_entry(self, row: Dict[str, Any]) -> BaseCatalogEntry:
         """
         Parse a catalog row into the appropriate Pydantic model.
         """
         entry_type = row["entry_type"]
         model_class = ENTRY_TYPE_TO_MODEL.get(entry_type, BaseCatalogEntry)
-        properties = json.loads(row["properties"])
+        properties = orjson.loads(row["properties"])
         entry_data = {
             "id": row["id"],
             "name": row["name"],
             "entry_type": entry_type,
             "created_at": row["created_at"],
             "updated_at": row["updated_at"],
+            # Properties may override core fields (e.g. a renamed entry)
             **properties,
         }
-        return model_class(**entry_data)
+        # Rows were validated when they were added, so skip re-validation
+        return model_class.model_construct(**entry_data)
 
-    def get_entry_by_name(
-        self, name: str, entry_type: str
+    def _load_entry_by_name(
+        self, dt: DeltaTable, name: str, entry_type: str
     ) -> Optional[BaseCatalogEntry]:
-        """Get an entry from the catalog by name and type."""
-        dt = DeltaTable(self.catalog_path, storage_options=self.storage_options)
-        catalog_df = pl.read_delta(dt)
-
-        result = catalog_df.filter(
-            (pl.col("name") == name) & (pl.col("entry_type") == entry_type)
+        """Read a single entry by name and type from the given catalog table."""
+        # Filter inside the Delta scan so non-matching files can be skipped
+        result = (
+            pl.scan_delta(dt)
+            .filter((pl.col("name") == name) & (pl.col("entry_type") == entry_type))
+            .collect()
         )
         if len(result) == 0:
             return None
 
         return self._parse_entry(result.row(0, named=True))
 
+    def get_entry_by_name(
+        self, name: str, entry_type: str
+    ) -> Optional[BaseCatalogEntry]:
+        """Get an entry from the catalog by name and type."""
+        return self._cached(
+            ("entry_by_name", name, entry_type),
+            lambda dt: self._load_entry_by_name(dt, name, entry_type),
+        )
+
+    async def aget_entry_by_name(
+        self, name: str, entry_type: str
+    ) -> Optional[BaseCatalogEntry]:
+        """
+        Get an entry from the catalog by name and type without blocking the event
+        loop. Concurrent calls read the catalog in parallel, each from its own
+        table snapshot, and bypass the lookup cache.
+        """
+
+        def load() -> Optional[BaseCatalogEntry]:
+            dt = DeltaTable(self.catalog_path, storage_options=self.storage_options)
+            return self._load_entry_by_name(dt, name, entry_type)
+
+        return await asyncio.to_thread(load)
+
+    def get_entries_by_names(
+        self, names: List[str], entry_type: str
+    ) -> Dict[str, BaseCatalogEntry]:
+        """
+        Get several entries of one type in a single catalog scan.
+
+        Args:
+            names: Names of the entries
+            entry_type: Type of the entries
+
+        Returns:
+            Dict[str, BaseCatalogEntry]: Entries found, keyed by name
+        """
+
+        def load(dt: DeltaTable) -> Dict[str, BaseCatalogEntry]:
+            result = (
+                pl.scan_delta(dt)
+                .filter(
+                    pl.col("name").is_in(names) & (pl.col("entry_type") == entry_type)
+                )
+                .collect()
+            )
+            return {
+                row["name"]: self._parse_entry(row)
+                for row in result.iter_rows(named=True)
+            }
+
+        key = ("entries_by_names", tuple(sorted(set(names))), entry_type)
+        return dict(self._cached(key, load))
+
+    def _load_entries(
+        self, dt: DeltaTable, entry_type: Optional[str]
+    ) -> List[BaseCatalogEntry]:
+        """Read catalog entries, optionally filtered by type, from the given table."""
+        # Filter inside the Delta scan so files of other entry types can be skipped
+        lf = pl.scan_delta(dt)
+        if entry_type:
+            lf = lf.filter(pl.col("entry_type") == entry_type)
+
+        # Appended entries can land in any file order, so list them by creation
+        catalog_df = lf.sort("created_at", maintain_order=True).collect()
+
+        return [self._parse_entry(row) for row in catalog_df.iter_rows(named=True)]
+
     def list_entries(self, entry_type: Optional[str] = None) -> List[BaseCatalogEntry]:
         """
         List catalog entries, optionally filtered by type.
@@ -172,13 +318,31 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
         Returns:
             List[BaseCatalogEntry]: List of catalog entries
         """
-        dt = DeltaTable(self.catalog_path, storage_options=self.storage_options)
-        catalog_df = pl.read_delta(dt)
+        return list(
+            self._cached(
+                ("entries", entry_type), lambda dt: self._load_entries(dt, entry_type)
+            )
+        )
 
-        if entry_type:
-            catalog_df = catalog_df.filter(pl.col("entry_type") == entry_type)
+    async def alist_entries(
+        self, entry_type: Optional[str] = None
+    ) -> List[BaseCatalogEntry]:
+        """
+        List catalog entries without blocking the event loop. Reads its own table
+        snapshot and bypasses the lookup cache.
 
-        return [self._parse_entry(row) for row in catalog_df.iter_rows(named=True)]
+        Args:
+            entry_type: Filter entries by type
+
+        Returns:
+            List[BaseCatalogEntry]: List of catalog entries
+        """
+
+        def load() -> List[BaseCatalogEntry]:
+            dt = DeltaTable(self.catalog_path, storage_options=self.storage_options)
+            return self._load_entries(dt, entry_type)
+
+        return await asyncio.to_thread(load)
 
     def update_entry(
         self, entry_name: str, entry_type: str, properties: Dict[str, Any]
@@ -200,6 +364,14 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
 
         # Update properties
         current_props = current_entry.model_dump()
+
+        # Skip the merge commit when every property already has the requested value
+        if all(
+            key in current_props and current_props[key] == value
+            for key, value in properties.items()
+        ):
+            return True
+
         core_fields = ["id", "name", "entry_type", "created_at", "updated_at"]
         for field in core_fields:
             current_props.pop(field, None)
@@ -211,22 +383,22 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
                 {
                     "id": current_entry.id,
                     "updated_at": datetime.now(),
-                    "properties": json.dumps(current_props),
+                    "properties": orjson.dumps(current_props).decode(),
                 }
             ]
         )
 
-        # Perform merge operation
-        update_df.write_delta(
-            self.catalog_path,
-            mode="merge",
-            delta_merge_options={
-                "predicate": "s.id = t.id",
-                "source_alias": "s",
-                "target_alias": "t",
-            },
-            storage_options=self.storage_options,
-        ).when_matched_update_all().execute()
+        # Perform merge operation, touching only the columns that change
+        dt = self._table()
+        dt.merge(
+            source=update_df.to_arrow(),
+            predicate="s.id = t.id",
+            source_alias="s",
+            target_alias="t",
+        ).when_matched_update(
+            updates={"properties": "s.properties", "updated_at": "s.updated_at"}
+        ).execute()
+        self._committed()
 
         return True
 
@@ -240,24 +412,15 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
         Returns:
             bool: True if the entry was deleted, False if not found
         """
-        dt = DeltaTable(self.catalog_path, storage_options=self.storage_options)
-        catalog_df = pl.read_delta(dt)
+        dt = self._table()
 
-        # Filter out the entry
-        filtered_df = catalog_df.filter(pl.col("name") != entry_name)
+        # Delete in place; only files containing the entry are rewritten
+        escaped_name = entry_name.replace("'", "''")
+        metrics = dt.delete(predicate=f"name = '{escaped_name}'")
+        self._committed()
 
-        if len(filtered_df) == len(catalog_df):
-            # No rows were removed
-            return False
-
-        # Write back to catalog
-        filtered_df.write_delta(
-            self.catalog_path,
-            mode="overwrite",
-            storage_options=self.storage_options,
-        )
-
-        return True
+        # No rows were removed
+        return metrics.get("num_deleted_rows", 0) > 0
 
     def get_or_create_timelake_config(
         self,
@@ -273,16 +436,21 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
             return configs[0].id, configs[0]
 
         # Create a new configuration
+        storage_type = (
+            storage.storage_type.value
+            if storage.storage_type is not None
+            else storage.__class__.__name__
+        )
         config = TimeLakeEntry(
             timestamp_column=timestamp_column,
             timestamp_partition_column=preprocessor.get_timestamp_partition_column(
                 timestamp_column
             ),
             partition_by=preprocessor.get_default_partitions(timestamp_column),
-            timelake_id=str(uuid.uuid4()),
+            timelake_id=uuid.uuid4().hex,
             timelake_storage=storage.__class__.__name__,
             timelake_preprocessor=preprocessor.__class__.__name__,
-            storage_type=storage.__class__.__name__,
+            storage_type=storage_type,
             name=os.path.basename(self.path),
         )
         config_id = self.add_entry(config)
@@ -295,6 +463,7 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
         df: pl.DataFrame,
         partition_columns: List[str],
         storage_options: Optional[Dict[str, Any]] = None,
+        writer_properties: Optional[WriterProperties] = None,
     ) -> DatasetEntry:
         """
         Create a new dataset in the catalog.
@@ -305,6 +474,7 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
             df: Data to write
             partition_columns: Columns to partition by
             storage_options: Storage options for writing the dataset
+            writer_properties: Parquet writer settings, e.g. compression
 
         Returns:
             DatasetEntry: The created dataset entry
@@ -327,7 +497,10 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
             path,
             mode="overwrite",
             storage_options=storage_options,
-            delta_write_options={"partition_by": partition_columns},
+            delta_write_options={
+                "partition_by": partition_columns,
+                "writer_properties": writer_properties,
+            },
         )
 
         return dataset_entry
@@ -339,15 +512,25 @@ class TimeLakeCatalog(BaseTimeLakeCatalog):
         Returns:
             Optional[TimeLakeEntry]: The TimeLake configuration if found, else None.
         """
-        dt = DeltaTable(self.catalog_path, storage_options=self.storage_options)
-        catalog_df = pl.read_delta(dt)
-
-        # Filter for the TimeLake configuration entry
-        result = catalog_df.filter(
-            pl.col("entry_type") == CatalogEntryType.TIMELAKE_CONFIG.value
-        )
-        if len(result) == 0:
-            return None
 
-        # Parse the first matching entry as a TimeLakeEntry
-        return self._parse_entry(result.row(0, named=True))  # Typed as TimeLakeEntry
+        def load(dt: DeltaTable) -> Optional[TimeLakeEntry]:
+            table_id, version = dt.metadata().id, dt.version()
+            cached = _TIMELAKE_CONFIGS.get(self.catalog_path)
+            if cached is not None and cached[:2] == (table_id, version):
+                return cached[2]
+
+            # Filter for the TimeLake configuration entry inside the Delta scan
+            result = (
+                pl.scan_delta(dt)
+                .filter(pl.col("entry_type") == CatalogEntryType.TIMELAKE_CONFIG.value)
+                .collect()
+            )
+
+            # Parse the first matching entry as a TimeLakeEntry
+            config = None
+            if len(result) > 0:
+                config = self._parse_entry(result.row(0, named=True))
+            _TIMELAKE_CONFIGS[self.catalog_path] = (table_id, version, config)
+            return config
+
+        return self._cached(("timelake_config",), load)
@@ -1,8 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Iterator, List, Literal, Optional
 
 import polars as pl
-from deltalake import DeltaTable
+import pyarrow as pa
+import pyarrow.dataset as pds
+from deltalake import DeltaTable, WriterProperties, write_deltalake
 
 from timelake.base import (
     BaseTimeLake,
@@ -20,6 +24,7 @@ from timelake.models import DatasetEntry, TimeLakeEntry
 from timelake.preprocessor import TimeLakePreprocessor
 from timelake.storage import TimeLakeStorage
 from timelake.utils import ensure_path
+from timelake.writer import BufferedWriter
 
 
 class TimeLake(BaseTimeLake):
@@ -30,6 +35,9 @@ class TimeLake(BaseTimeLake):
         preprocessor: BaseTimeLakePreprocessor,
         catalog: BaseTimeLakeCatalog,
         config: Optional[TimeLakeEntry] = None,
+        maintenance_every_writes: Optional[int] = None,
+        maintenance_target_size_mb: int = 128,
+        ensure_dirs: bool = True,
     ):
         """
         Initialize a TimeLake instance.
@@ -40,12 +48,21 @@ class TimeLake(BaseTimeLake):
             preprocessor: Preprocessor to use
             catalog: Catalog to use
             config: Optional preloaded config to avoid redundant catalog calls
+            maintenance_every_writes: Compact and checkpoint a dataset after this
+                many writes/upserts to it; disabled when None
+            maintenance_target_size_mb: Target file size for that compaction
+            ensure_dirs: Create the storage directories; skipped by open() and
+                create(), which already know the lake exists or created it
         """
         self.timestamp_column = timestamp_column
         self.storage = storage
         self.preprocessor = preprocessor
         self.catalog = catalog
-        self.path = ensure_path(self.storage.path)  # Ensure path is a Path object
+        self.path = ensure_path(self.storage.path)  # Ensure path is a str
+        self._storage_opts = self.storage.get_storage_options()
+
+        # Plain string join; pathlib would collapse the "//" of s3:// URIs
+        self._datasets_base = f"{str(self.path).rstrip('/')}/{DATASETS_FOLDER}"
 
         # Use the provided config or fetch it from the catalog
         if config:
@@ -58,8 +75,32 @@ class TimeLake(BaseTimeLake):
                 storage=self.storage,
             )
 
+        # Merge join condition for upserts; only the partition bounds vary per call
+        self._merge_key_predicate = f"s.{timestamp_column} = t.{timestamp_column}"
+
+        # Dataset table handles, refreshed incrementally instead of replaying the log
+        self._dt_cache: Dict[str, DeltaTable] = {}
+
+        # Opt-in dataset maintenance, counted per dataset name
+        self._maintenance_every_writes = maintenance_every_writes
+        self._maintenance_target_size = maintenance_target_size_mb << 20
+        self._writes_since_maintenance: Dict[str, int] = {}
+
+        # Resolved once so the write path does no config lookups per call
+        self._partition_by = list(self.config.partition_by)
+        self._writer_properties = WriterProperties(
+            compression=self.config.parquet_compression.upper(),
+            compression_level=self.config.parquet_compression_level,
+        )
+        self._delta_write_options: Dict[str, Any] = {
+            "writer_properties": self._writer_properties
+        }
+        if self._partition_by:
+            self._delta_write_options["partition_by"] = self._partition_by
+
         # Ensure storage is ready
-        self.storage.ensure_directories()
+        if ensure_dirs:
+            self.storage.ensure_directories()
 
     @classmethod
     def create(
@@ -69,6 +110,8 @@ class TimeLake(BaseTimeLake):
         storage_type: StorageType = StorageType.LOCAL,
         storage_kwargs: Optional[dict] = None,
         preprocessor: Optional[BaseTimeLakePreprocessor] = None,
+        maintenance_every_writes: Optional[int] = None,
+        maintenance_target_size_mb: int = 128,
     ) -> "TimeLake":
         """
         Create a new TimeLake.
@@ -79,6 +122,8 @@ class TimeLake(BaseTimeLake):
             storage_type: Type of storage to use
             storage_kwargs: Storage-specific kwargs
             preprocessor: Optional preprocessor to use
+            maintenance_every_writes: Writes per dataset between maintenance runs
+            maintenance_target_size_mb: Target file size for maintenance compaction
 
         Returns:
             TimeLake: The created TimeLake instance
@@ -99,6 +144,9 @@ class TimeLake(BaseTimeLake):
             storage=storage,
             preprocessor=preprocessor,
             catalog=catalog,
+            maintenance_every_writes=maintenance_every_writes,
+            maintenance_target_size_mb=maintenance_target_size_mb,
+            ensure_dirs=False,
         )
 
     @classmethod
@@ -108,6 +156,8 @@ class TimeLake(BaseTimeLake):
         storage_type: StorageType = StorageType.LOCAL,
         storage_kwargs: Optional[dict] = None,
         preprocessor: Optional[BaseTimeLakePreprocessor] = None,
+        maintenance_every_writes: Optional[int] = None,
+        maintenance_target_size_mb: int = 128,
     ) -> "TimeLake":
         """
         Open an existing TimeLake.
@@ -117,6 +167,8 @@ class TimeLake(BaseTimeLake):
             storage_type: Type of storage
             storage_kwargs: Storage-specific kwargs
             preprocessor: Optional preprocessor to use
+            maintenance_every_writes: Writes per dataset between maintenance runs
+            maintenance_target_size_mb: Target file size for maintenance compaction
 
         Returns:
             TimeLake: The opened TimeLake instance
@@ -148,6 +200,9 @@ class TimeLake(BaseTimeLake):
             preprocessor=preprocessor,
             catalog=catalog,
             config=config,
+            maintenance_every_writes=maintenance_every_writes,
+            maintenance_target_size_mb=maintenance_target_size_mb,
+            ensure_dirs=False,
         )
 
     def write(
@@ -164,43 +219,259 @@ class TimeLake(BaseTimeLake):
             name: Name of the dataset
             mode: Write mode (append or overwrite)
         """
+        # Nothing to commit; skips preprocessing and an empty Delta commit
+        if df.is_empty():
+            return
+
+        # A new dataset is created with the data itself, in a single commit
+        dataset = self.get_dataset(name)
+        if dataset is None:
+            self.create_dataset(
+                name=name, df=self._preprocess(df), skip_preprocess=True
+            )
+            return
+
+        self._write_dataset(dataset, df, mode)
+
+    def _preprocess(self, df: pl.DataFrame) -> pl.DataFrame:
         processed_df = self.preprocessor.run(df, self.timestamp_column)
-        dataset = self.get_or_create_dataset(name=name, df=processed_df)
+        # Contiguous buffers let the writer emit larger Parquet row groups
+        if processed_df.n_chunks() > 1:
+            processed_df = processed_df.rechunk()
+        return processed_df
 
-        processed_df.write_delta(
+    def _write_dataset(
+        self,
+        dataset: DatasetEntry,
+        df: pl.DataFrame,
+        mode: Literal["append", "overwrite"],
+    ) -> None:
+        """Write data to an existing dataset."""
+        # Hand Delta the Arrow data directly; the polars wrapper would also set up
+        # a credential provider on every call
+        write_deltalake(
             dataset.path,
+            self._preprocess(df).to_arrow(compat_level=pl.CompatLevel.newest()),
             mode=mode,
-            delta_write_options={"partition_by": self.config.partition_by},
-            storage_options=self.storage.get_storage_options(),
+            storage_options=self._storage_opts,
+            **self._delta_write_options,
+        )
+        self._maybe_run_maintenance(dataset)
+
+    def buffered_writes(
+        self,
+        name: str,
+        max_bytes: int = 64 << 20,
+        max_seconds: float = 5.0,
+    ) -> BufferedWriter:
+        """
+        Buffer small writes to a dataset and append them in batches, one commit per
+        flush. Use as a context manager so the remainder is flushed on exit:
+
+            with lake.buffered_writes("prices") as writer:
+                writer.write(df)
+
+        Rows of a batch share the inserted_at of the flush that wrote them.
+
+        Args:
+            name: Name of the dataset
+            max_bytes: Flush once the buffered frames reach this estimated size
+            max_seconds: Flush on the first write this long after buffering started
+
+        Returns:
+            BufferedWriter: The buffered writer
+        """
+        return BufferedWriter(
+            self, name=name, max_bytes=max_bytes, max_seconds=max_seconds
+        )
+
+    def write_many(
+        self,
+        batches: Dict[str, pl.DataFrame],
+        mode: Literal["append", "overwrite"] = "append",
+        max_workers: int = 8,
+    ) -> None:
+        """
+        Write data to several datasets, overlapping the per-dataset writes.
+
+        Args:
+            batches: Data to write, keyed by dataset name
+            mode: Write mode (append or overwrite)
+            max_workers: Maximum number of concurrent dataset writes
+        """
+        # Look up all datasets in one catalog scan
+        datasets = self.catalog.get_entries_by_names(
+            list(batches), entry_type=CatalogEntryType.DATASET.value
         )
 
-    def upsert(self, df: pl.DataFrame, name: str) -> None:
+        # New datasets are written one by one since creating them adds entries
+        # to the shared catalog table
+        existing = []
+        for name, df in batches.items():
+            if name not in datasets:
+                self.write(df, name=name, mode=mode)
+            elif not df.is_empty():
+                existing.append(name)
+
+        # Each remaining write targets its own Delta table; Delta and Parquet
+        # encoding release the GIL, so the writes run concurrently. The threads
+        # use the entries found above and never touch the shared catalog handle
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._write_dataset, datasets[name], batches[name], mode
+                )
+                for name in existing
+            ]
+            for future in futures:
+                future.result()
+
+    def upsert(
+        self,
+        df: pl.DataFrame,
+        name: str,
+        upsert_strategy: Literal["merge", "delete_append"] = "merge",
+    ) -> None:
         """
         Upsert data into a dataset in the TimeLake.
 
         Args:
             df: Data to upsert
             name: Name of the dataset
+            upsert_strategy: "merge" runs a Delta merge on the timestamp column.
+                "delete_append" rewrites only the incoming timestamp range,
+                keeping the existing rows in it whose timestamps are not
+                upserted, without a merge join. Both run as a single commit and
+                are equivalent as long as timestamps are unique per dataset
         """
-        processed_df = self.preprocessor.run(df, self.timestamp_column)
-        dataset = self.get_or_create_dataset(name=name, df=processed_df)
+        # Nothing to commit; skips preprocessing and an empty Delta commit
+        if df.is_empty():
+            return
+
+        processed_df = self._preprocess(df)
+
+        # A new dataset is created with the data itself, in a single commit
+        dataset = self.get_dataset(name)
+        if dataset is None:
+            self.create_dataset(name=name, df=processed_df, skip_preprocess=True)
+            return
+
+        # Bound the target side to the incoming day partitions so only files that
+        # can match are scanned instead of the whole table
+        ts = self.timestamp_column
+        partition_column = self.config.timestamp_partition_column
+        partition_bounds = processed_df.select(
+            pl.col(partition_column).min().alias("min"),
+            pl.col(partition_column).max().alias("max"),
+        ).row(0, named=True)
+        partition_predicate = (
+            f"{partition_column} BETWEEN "
+            f"'{partition_bounds['min']}' AND '{partition_bounds['max']}'"
+        )
 
-        processed_df.write_delta(
-            dataset.path,
-            mode="merge",
-            delta_merge_options={
-                "predicate": f"s.{self.timestamp_column} = t.{self.timestamp_column}",
-                "source_alias": "s",
-                "target_alias": "t",
-            },
-        ).when_matched_update_all().when_not_matched_insert_all().execute()
+        if upsert_strategy == "delete_append":
+            # Replace the incoming time range in one commit: existing rows in the
+            # range that are not being upserted are carried over with the new data,
+            # so a failure can't leave the rows deleted without their replacement
+            dt = self._dataset_table(dataset)
+            table_lf = pl.scan_delta(dt)
+
+            # Filters and the rewritten rows use the table's own column types, e.g.
+            # UTC timestamps or the String day partitions of older datasets
+            table_schema = table_lf.collect_schema()
+            processed_df = processed_df.cast(
+                {col: table_schema[col] for col in processed_df.columns}
+            )
+            timestamps = processed_df.get_column(ts)
+            partitions = processed_df.get_column(partition_column)
+            range_predicate = (
+                f"{partition_predicate} AND {ts} BETWEEN "
+                f"'{timestamps.min()}' AND '{timestamps.max()}'"
+            )
+            kept_df = (
+                table_lf.filter(
+                    pl.col(partition_column).is_between(
+                        pl.lit(partitions.min()), pl.lit(partitions.max())
+                    )
+                    & pl.col(ts).is_between(
+                        pl.lit(timestamps.min()), pl.lit(timestamps.max())
+                    )
+                    & ~pl.col(ts).is_in(timestamps)
+                )
+                .select(processed_df.columns)
+                .collect()
+            )
+            write_deltalake(
+                dt,
+                pl.concat([kept_df, processed_df]).to_arrow(
+                    compat_level=pl.CompatLevel.newest()
+                ),
+                mode="overwrite",
+                predicate=range_predicate,
+                storage_options=self._storage_opts,
+                **self._delta_write_options,
+            )
+        else:
+            self._dataset_table(dataset).merge(
+                source=processed_df.to_arrow(compat_level=pl.CompatLevel.newest()),
+                predicate=f"{self._merge_key_predicate} AND t.{partition_predicate}",
+                source_alias="s",
+                target_alias="t",
+                writer_properties=self._writer_properties,
+            ).when_matched_update_all().when_not_matched_insert_all().execute()
+        self._maybe_run_maintenance(dataset)
+
+    def _maybe_run_maintenance(self, dataset_entry: DatasetEntry) -> None:
+        """
+        Count a write to a dataset and, every maintenance_every_writes writes,
+        compact its small files and checkpoint its log so the Delta log stays
+        bounded under many small writes.
+        """
+        if not self._maintenance_every_writes:
+            return
+
+        name = dataset_entry.name
+        writes = self._writes_since_maintenance.get(name, 0) + 1
+        if writes < self._maintenance_every_writes:
+            self._writes_since_maintenance[name] = writes
+            return
+
+        dt = self._dataset_table(dataset_entry)
+        dt.optimize.compact(target_size=self._maintenance_target_size)
+        dt.create_checkpoint()
+        self._writes_since_maintenance[name] = 0
+
+    def refresh_storage_options(self) -> None:
+        """
+        Re-read the storage options, e.g. after credentials were rotated, and pass
+        them on to the catalog. Cached table handles are dropped since they hold
+        the old options.
+        """
+        self._storage_opts = self.storage.reload_storage_options()
+        self._dt_cache.clear()
+        self.catalog.set_storage_options(self._storage_opts)
+
+    def _dataset_table(self, dataset_entry: DatasetEntry) -> DeltaTable:
+        """
+        Return the Delta table handle of a dataset, fetching only log entries added
+        since it was last used.
+        """
+        dt = self._dt_cache.get(dataset_entry.name)
+        if dt is None:
+            dt = DeltaTable(dataset_entry.path, storage_options=self._storage_opts)
+            self._dt_cache[dataset_entry.name] = dt
+        else:
+            dt.update_incremental()
+        return dt
 
     def read(
         self,
         dataset: str,
         start_date: str = None,
         end_date: str = None,
-    ) -> pl.DataFrame:
+        lazy: bool = False,
+        columns: Optional[List[str]] = None,
+    ) -> pl.DataFrame | pl.LazyFrame:
         """
         Read data from a specific dataset in the TimeLake.
 
@@ -208,42 +479,144 @@ class TimeLake(BaseTimeLake):
             dataset: Name of the dataset to read from
             start_date: Start date filter
             end_date: End date filter
+            lazy: Return a LazyFrame so further filters are pushed into the scan
+            columns: Columns to read; unselected columns are never decoded
 
         Returns:
-            pl.DataFrame: The filtered data
+            pl.DataFrame | pl.LazyFrame: The filtered data
         """
         # Get the dataset entry
         dataset_entry = self.get_dataset(name=dataset)
         if not dataset_entry:
             raise ValueError(f"Dataset '{dataset}' does not exist in the TimeLake.")
 
-        # Get the dataset path
-        dataset_path = dataset_entry.path
+        lf = pl.scan_delta(self._dataset_table(dataset_entry))
 
-        # Initialize the DeltaTable
-        dt = DeltaTable(
-            dataset_path, storage_options=self.storage.get_storage_options()
-        )
-
-        # Build filters
-        filters = []
-        timestamp_partition_column = self.config.timestamp_partition_column
+        # Build the day-partition predicates as expressions so they are pushed
+        # into the Delta scan and prune partitions before any data is read
+        predicates = []
+        partition_column = self.config.timestamp_partition_column
+        partition_dtype = lf.collect_schema()[partition_column]
         if start_date:
-            filters.append((timestamp_partition_column, ">=", start_date))
+            predicates.append(
+                pl.col(partition_column)
+                >= self._partition_bound(start_date, partition_dtype)
+            )
         if end_date:
-            filters.append((timestamp_partition_column, "<=", end_date))
+            predicates.append(
+                pl.col(partition_column)
+                <= self._partition_bound(end_date, partition_dtype)
+            )
 
         # Read the data with or without filters
-        if filters:
-            return pl.read_delta(
-                dt,
-                pyarrow_options={"partitions": filters},
-                use_pyarrow=True,
-            )
-        return pl.read_delta(
-            dt,
-            use_pyarrow=True,
+        if predicates:
+            lf = lf.filter(*predicates)
+        if columns:
+            lf = lf.select(columns)
+        return lf if lazy else lf.collect()
+
+    @staticmethod
+    def _partition_bound(value: str, dtype: pl.DataType) -> pl.Expr:
+        """
+        Build a day-partition bound in the partition column's stored type.
+        Datasets written before day partitions became pl.Date store them as
+        ISO date strings, which compare correctly as strings.
+
+        Args:
+            value: ISO date, e.g. "2023-01-01"
+            dtype: Type of the partition column in the dataset
+
+        Returns:
+            pl.Expr: The bound as a literal of the column's type
+        """
+        bound = pl.lit(value)
+        return bound if dtype == pl.String else bound.cast(pl.Date)
+
+    def iter_batches(
+        self,
+        dataset: str,
+        start_date: str = None,
+        end_date: str = None,
+        columns: Optional[List[str]] = None,
+        batch_size: int = 100_000,
+    ) -> Iterator[pl.DataFrame]:
+        """
+        Stream a specific dataset in the TimeLake as batches, so peak memory is
+        bounded by the batch size rather than the size of the date range.
+
+        Args:
+            dataset: Name of the dataset to read from
+            start_date: Start date filter
+            end_date: End date filter
+            columns: Columns to read
+            batch_size: Maximum number of rows per batch
+
+        Yields:
+            pl.DataFrame: The filtered data, one batch at a time
+        """
+        dataset_entry = self.get_dataset(name=dataset)
+        if not dataset_entry:
+            raise ValueError(f"Dataset '{dataset}' does not exist in the TimeLake.")
+
+        arrow_dataset = self._dataset_table(dataset_entry).to_pyarrow_dataset()
+
+        # Same day-partition bounds as read(), as Arrow expressions so pyarrow
+        # prunes partitions before streaming the remaining files. String
+        # partitions of older datasets are compared as ISO date strings
+        partition_column = self.config.timestamp_partition_column
+        partition_type = arrow_dataset.schema.field(partition_column).type
+        as_string = pa.types.is_string(partition_type) or pa.types.is_large_string(
+            partition_type
         )
+        row_filter = None
+        if start_date:
+            lower = start_date if as_string else date.fromisoformat(start_date)
+            row_filter = pds.field(partition_column) >= lower
+        if end_date:
+            upper = end_date if as_string else date.fromisoformat(end_date)
+            upper_filter = pds.field(partition_column) <= upper
+            row_filter = (
+                upper_filter if row_filter is None else row_filter & upper_filter
+            )
+
+        for batch in arrow_dataset.to_batches(
+            columns=columns, filter=row_filter, batch_size=batch_size
+        ):
+            if batch.num_rows:
+                yield pl.from_arrow(batch)
+
+    def optimize(
+        self,
+        dataset: str,
+        zorder_by: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compact a dataset, optionally Z-ordering it by secondary columns.
+
+        Partition columns are dropped from zorder_by since partition pruning
+        already covers them.
+
+        Args:
+            dataset: Name of the dataset to optimize
+            zorder_by: Columns to Z-order by
+
+        Returns:
+            Dict[str, Any]: Optimize metrics reported by Delta
+        """
+        dataset_entry = self.get_dataset(name=dataset)
+        if not dataset_entry:
+            raise ValueError(f"Dataset '{dataset}' does not exist in the TimeLake.")
+
+        dt = self._dataset_table(dataset_entry)
+
+        partition_columns = set(self._partition_by)
+        partition_columns.add(self.config.timestamp_partition_column)
+        zorder_columns = [
+            col for col in zorder_by or [] if col not in partition_columns
+        ]
+        if zorder_columns:
+            return dt.optimize.z_order(zorder_columns)
+        return dt.optimize.compact()
 
     # Catalog-based dataset methods
 
@@ -251,6 +624,7 @@ class TimeLake(BaseTimeLake):
         self,
         name: str,
         df: pl.DataFrame,
+        skip_preprocess: bool = False,
     ) -> str:
         """
         Create a new dataset in the TimeLake.
@@ -258,23 +632,28 @@ class TimeLake(BaseTimeLake):
         Args:
             name: Name of the dataset
             df: Data to write
+            skip_preprocess: df was already run through the preprocessor
 
         Returns:
             str: ID of the created dataset
         """
-        dataset_path = Path(self.path) / DATASETS_FOLDER / name
+        dataset_path = f"{self._datasets_base}/{name}"
 
         # Process the data
-        processed_df = self.preprocessor.run(df, self.timestamp_column)
+        processed_df = (
+            df if skip_preprocess else self.preprocessor.run(df, self.timestamp_column)
+        )
 
         # Delegate dataset creation to the catalog
-        return self.catalog.create_dataset(
+        dataset = self.catalog.create_dataset(
             name=name,
-            path=str(dataset_path),
+            path=dataset_path,
             df=processed_df,
-            partition_columns=self.config.partition_by,
-            storage_options=self.storage.get_storage_options(),
+            partition_columns=self._partition_by,
+            storage_options=self._storage_opts,
+            writer_properties=self._writer_properties,
         )
+        return dataset
 
     def list_datasets(self) -> List[Dict[str, Any]]:
         """
@@ -303,6 +682,7 @@ class TimeLake(BaseTimeLake):
         self,
         name: str,
         df: Optional[pl.DataFrame] = None,
+        skip_preprocess: bool = False,
     ) -> DatasetEntry:
         """
         Get an existing dataset or create a new one.
@@ -310,14 +690,13 @@ class TimeLake(BaseTimeLake):
         Args:
             name: Name of the dataset
             df: Optional data to write if creating new dataset
+            skip_preprocess: df was already run through the preprocessor
 
         Returns:
             DatasetEntry: The dataset entry
         """
         # Try to get existing dataset
-        existing = self.catalog.get_entry_by_name(
-            name=name, entry_type=CatalogEntryType.DATASET.value
-        )
+        existing = self.get_dataset(name)
         if existing:
             return existing
 
@@ -325,4 +704,4 @@ class TimeLake(BaseTimeLake):
         if df is None:
             raise ValueError("DataFrame must be provided when creating new dataset")
 
-        return self.create_dataset(name=name, df=df)
+        return self.create_dataset(name=name, df=df, skip_preprocess=skip_preprocess)
@@ -41,6 +41,8 @@ class TimeLakeEntry(BaseCatalogEntry):
     timelake_version: str = TIMELAKE_VERSION
     inserted_at_column: str = TimeLakeColumns.INSERTED_AT.value
     storage_type: str = Field(default=StorageType.LOCAL.value)
+    parquet_compression: str = "ZSTD"  # Parquet codec for dataset writes
+    parquet_compression_level: Optional[int] = 3  # None for codecs without levels
 
     def __init__(self, **data):
         data["entry_type"] = CatalogEntryType.TIMELAKE_CONFIG.value
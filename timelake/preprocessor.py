@@ -8,49 +8,74 @@ from timelake.constants import TimeLakeColumns
 
 
 class TimeLakePreprocessor(BaseTimeLakePreprocessor):
-    def validate_dataframe(self, df: pl.DataFrame, timestamp_column: str) -> None:
-        if df.shape[0] == 0:
+    def validate_dataframe(
+        self, df: pl.DataFrame | pl.LazyFrame, timestamp_column: str
+    ) -> None:
+        # LazyFrames are checked on their schema; only one row is ever collected
+        if isinstance(df, pl.LazyFrame):
+            is_empty = df.limit(1).collect().is_empty()
+        else:
+            is_empty = df.is_empty()
+        if is_empty:
             raise ValueError("DataFrame is empty.")
-        if timestamp_column not in df.columns:
+
+        if timestamp_column not in df.collect_schema():
             raise ValueError(f"Timestamp column '{timestamp_column}' is missing.")
 
-    def validate_partitions(self, df: pl.DataFrame, partition_by: List[str]) -> None:
+    def validate_partitions(
+        self, df: pl.DataFrame | pl.LazyFrame | pl.Schema, partition_by: List[str]
+    ) -> None:
         if not partition_by:
             raise ValueError("Partition columns are empty.")
-        for column in partition_by:
-            if column not in df.columns:
-                raise ValueError(f"Partition column '{column}' is missing.")
         if len(set(partition_by)) != len(partition_by):
             raise ValueError("Partition columns must be unique.")
 
+        # Partition checks only need column names, so a bare schema is accepted too
+        schema = df if isinstance(df, pl.Schema) else df.collect_schema()
+        columns = set(schema.names())
+        missing = [column for column in partition_by if column not in columns]
+        if len(missing) == 1:
+            raise ValueError(f"Partition column '{missing[0]}' is missing.")
+        if missing:
+            names = ", ".join(f"'{column}'" for column in missing)
+            raise ValueError(f"Partition columns {names} are missing.")
+
     def get_timestamp_partition_column(self, timestamp_column: str) -> str:
         return f"{timestamp_column}_day"
 
     def get_default_partitions(self, timestamp_column: str) -> List[str]:
         return [self.get_timestamp_partition_column(timestamp_column)]
 
-    def add_inserted_at_column(self, df: pl.DataFrame) -> pl.DataFrame:
+    @staticmethod
+    def _inserted_at_expr() -> pl.Expr:
+        # A single scalar literal broadcast to every row, not a per-row Series
         now = datetime.now()
-        return df.with_columns(
-            pl.lit(now).cast(pl.Datetime).alias(TimeLakeColumns.INSERTED_AT.value)
+        return pl.lit(now, dtype=pl.Datetime("us")).alias(
+            TimeLakeColumns.INSERTED_AT.value
         )
 
-    def enrich_partitions(
-        self, df: pl.DataFrame, timestamp_column: str
-    ) -> pl.DataFrame:
+    def _partition_expr(self, timestamp_column: str) -> pl.Expr:
         day_partition = self.get_timestamp_partition_column(timestamp_column)
-        df = df.with_columns(
-            pl.col(timestamp_column)
-            .dt.truncate("1d")
-            .dt.strftime("%Y-%m-%d")
-            .alias(day_partition)
-        )
-        return df
+        # Native Date partition values allow typed partition pruning on read
+        return pl.col(timestamp_column).dt.date().alias(day_partition)
 
-    def prepare_data(self, df: pl.DataFrame, timestamp_column: str) -> pl.DataFrame:
-        df = self.enrich_partitions(df, timestamp_column)
-        df = self.add_inserted_at_column(df)
-        return df
+    def add_inserted_at_column(
+        self, df: pl.DataFrame | pl.LazyFrame
+    ) -> pl.DataFrame | pl.LazyFrame:
+        return df.with_columns(self._inserted_at_expr())
+
+    def enrich_partitions(
+        self, df: pl.DataFrame | pl.LazyFrame, timestamp_column: str
+    ) -> pl.DataFrame | pl.LazyFrame:
+        return df.with_columns(self._partition_expr(timestamp_column))
+
+    def prepare_data(
+        self, df: pl.DataFrame | pl.LazyFrame, timestamp_column: str
+    ) -> pl.DataFrame | pl.LazyFrame:
+        # Both columns in one with_columns, so the frame is rebuilt only once
+        return df.with_columns(
+            self._partition_expr(timestamp_column), self._inserted_at_expr()
+        )
 
     def run(
         self,
@@ -58,6 +83,8 @@ class TimeLakePreprocessor(BaseTimeLakePreprocessor):
         timestamp_column: str,
     ) -> pl.DataFrame:
         self.validate_dataframe(df, timestamp_column)
-        df = self.prepare_data(df, timestamp_column)
-        self.validate_partitions(df, self.get_default_partitions(timestamp_column))
-        return df
+        # Enrichment runs as one lazy plan so its column steps are fused into a
+        # single pass; partitions are checked on the plan's schema before collecting
+        lf = self.prepare_data(df.lazy(), timestamp_column)
+        self.validate_partitions(lf, self.get_default_partitions(timestamp_column))
+        return lf.collect()
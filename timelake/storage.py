@@ -3,40 +3,56 @@ from pathlib import Path
 
 from timelake.base import BaseTimeLakeStorage
 from timelake.constants import StorageType
+from timelake.utils import ensure_path
 
 
 class TimeLakeStorage(BaseTimeLakeStorage):
-    def __init__(self, path: Path):
-        self.path = path
+    # Storage handles carry a few fixed attributes; slots drop the per-instance dict
+    __slots__ = ("path",)
+
+    def __init__(self, path: Path | str):
+        # Stored as str; Path is only accepted at the API boundary
+        self.path = ensure_path(path)
 
     @staticmethod
     def create_storage(
         storage_type: StorageType, path: Path, **kwargs
     ) -> "TimeLakeStorage":
-        if storage_type == StorageType.LOCAL:
-            return LocalTimeLakeStorage(path)
-        elif storage_type == StorageType.S3:
-            return S3TimeLakeStorage(path, **kwargs)
-        else:
+        storage_class = STORAGE_TYPE_TO_CLASS.get(storage_type)
+        if storage_class is None:
             raise ValueError(f"Unsupported storage type: {storage_type}")
+        return storage_class(path, **kwargs)
 
 
 class LocalTimeLakeStorage(TimeLakeStorage):
-    def __init__(self, path: Path):
+    __slots__ = ("_directories_verified",)
+    storage_type = StorageType.LOCAL
+
+    def __init__(self, path: Path | str, **kwargs):
+        # Storage kwargs only configure remote backends; local storage ignores them
         super().__init__(path)
+        # Set once this handle has created or found its path; skips repeated stats
+        self._directories_verified = False
 
     def ensure_directories(self):
+        if self._directories_verified:
+            return
         os.makedirs(self.path, exist_ok=True)
+        self._directories_verified = True
 
     def get_storage_options(self) -> dict:
         return {}
 
 
 class S3TimeLakeStorage(TimeLakeStorage):
+    __slots__ = ("bucket_name", "_storage_options")
+    storage_type = StorageType.S3
+
     def __init__(self, path: str):
         super().__init__(path)
         self.bucket_name = self._extract_bucket_name(path)
-        self._validate_aws_credentials()
+        # Read once; Delta and Polars ask for the options on every write
+        self._storage_options = self._load_aws_credentials()
 
     @staticmethod
     def _extract_bucket_name(path: str) -> str:
@@ -45,27 +61,37 @@ class S3TimeLakeStorage(TimeLakeStorage):
         """
         if not path.startswith("s3://"):
             raise ValueError(f"Invalid S3 path: {path}. Must start with 's3:/'.")
-        bucket_name = path.split("/")[2]  # Extract bucket name from the path
+        # Bucket is everything between "s3://" and the next "/"
+        bucket_name = path[5:].partition("/")[0]
         if not bucket_name:
             raise ValueError(f"Bucket name could not be derived from path: {path}")
         return bucket_name
 
     @staticmethod
-    def _validate_aws_credentials():
+    def _load_aws_credentials() -> dict:
         required_env_vars = ["AWS_REGION", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"]
-        missing_vars = [var for var in required_env_vars if not os.getenv(var)]
+        credentials = {var: os.getenv(var) for var in required_env_vars}
+        missing_vars = [var for var, value in credentials.items() if not value]
         if missing_vars:
             raise ValueError(
                 f"Missing required AWS environment variables: {', '.join(missing_vars)}"
             )
+        return credentials
 
     def ensure_directories(self):
         # Placeholder: Ensure S3 bucket and paths exist
         pass
 
     def get_storage_options(self) -> dict:
-        return {
-            "AWS_REGION": os.getenv("AWS_REGION"),
-            "AWS_ACCESS_KEY_ID": os.getenv("AWS_ACCESS_KEY_ID"),
-            "AWS_SECRET_ACCESS_KEY": os.getenv("AWS_SECRET_ACCESS_KEY"),
-        }
+        return self._storage_options
+
+    def reload_storage_options(self) -> dict:
+        self._storage_options = self._load_aws_credentials()
+        return self._storage_options
+
+
+# Mapping for storage resolution in TimeLakeStorage.create_storage
+STORAGE_TYPE_TO_CLASS = {
+    storage_class.storage_type: storage_class
+    for storage_class in (LocalTimeLakeStorage, S3TimeLakeStorage)
+}
@@ -1,6 +1,7 @@
+import os
 from pathlib import Path
 
 
 # Utility function to ensure path is a str
-def ensure_path(path: Path | str) -> Path:
-    return str(path) if isinstance(path, Path) else path
+def ensure_path(path: Path | str) -> str:
+    return os.fspath(path)
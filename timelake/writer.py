@@ -0,0 +1,76 @@
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+import polars as pl
+
+if TYPE_CHECKING:
+    from timelake.core import TimeLake
+
+
+class BufferedWriter:
+    """
+    Collects small frames in memory and appends them to a dataset as one commit,
+    keeping the Delta log short under many small writes.
+    """
+
+    def __init__(
+        self,
+        lake: "TimeLake",
+        name: str,
+        max_bytes: int = 64 << 20,
+        max_seconds: float = 5.0,
+    ):
+        """
+        Initialize the buffered writer.
+
+        Args:
+            lake: TimeLake to write to
+            name: Name of the dataset
+            max_bytes: Flush once the buffered frames reach this estimated size
+            max_seconds: Flush on the first write this long after buffering started
+        """
+        self.lake = lake
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+
+        self._frames: List[pl.DataFrame] = []
+        self._buffered_bytes = 0
+        self._buffer_started: Optional[float] = None
+
+    def write(self, df: pl.DataFrame) -> None:
+        """
+        Buffer a frame, flushing when the size or age threshold is reached.
+
+        Args:
+            df: Data to write
+        """
+        if not self._frames:
+            self._buffer_started = time.monotonic()
+        self._frames.append(df)
+        self._buffered_bytes += df.estimated_size()
+
+        if (
+            self._buffered_bytes >= self.max_bytes
+            or time.monotonic() - self._buffer_started >= self.max_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Append all buffered frames to the dataset in a single write."""
+        if not self._frames:
+            return
+
+        df = pl.concat(self._frames, rechunk=True)
+        self._frames = []
+        self._buffered_bytes = 0
+        self._buffer_started = None
+        self.lake.write(df, name=self.name, mode="append")
+
+    def __enter__(self) -> "BufferedWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # Frames accepted before an error are still written, as unbuffered
+        # writes would have been
+        self.flush()